@@ -1,7 +1,7 @@
 
 from monetdbe.converters import register_adapter
 from monetdbe.monetize import PrepareProtocol
-from monetdbe.row import Row
+from monetdbe.row import Row, dict_row, namedtuple_row
 from monetdbe.version import monetdbe_version_info, __version__
 from monetdbe.cursors import Cursor  # type: ignore[attr-defined]
 from monetdbe.connection import Connection
@@ -0,0 +1,161 @@
+"""
+Conversion between monetdbe columns and Apache Arrow arrays. pyarrow is an optional dependency, this module is only
+imported when the Arrow functionality is used.
+"""
+from typing import Dict, Union
+
+import numpy as np
+import pyarrow as pa
+
+from monetdbe._lowlevel import ffi, lib
+from monetdbe._cffi.convert import make_string, monet_c_type_map, extract, get_null_value, is_decimal
+from monetdbe._cffi.internal import Result, ColumnBuffer, PackedValues, temporal_column_to_numpy
+from monetdbe._cffi.types_ import monetdbe_column
+
+primitive_arrow_types = {
+    lib.monetdbe_int8_t: pa.int8(),
+    lib.monetdbe_int16_t: pa.int16(),
+    lib.monetdbe_int32_t: pa.int32(),
+    lib.monetdbe_int64_t: pa.int64(),
+    lib.monetdbe_size_t: pa.int64(),
+    lib.monetdbe_float: pa.float32(),
+    lib.monetdbe_double: pa.float64(),
+}
+
+
+def numpy_to_arrow(arrow_type: pa.DataType, size: int, data: np.ndarray, mask: np.ndarray) -> pa.Array:
+    """
+    Create an Arrow array from a buffer of values and a null mask. The data buffer is used without copying.
+    """
+    null_count = int(np.count_nonzero(mask))
+    validity = pa.py_buffer(np.packbits(~mask, bitorder='little')) if null_count else None
+    return pa.Array.from_buffers(arrow_type, size, [validity, pa.py_buffer(data)], null_count=null_count)
+
+
+def packed_column_to_arrow(rcol: monetdbe_column, nrows: int) -> pa.Array:
+    """
+    Copy a monetdbe string or blob column into the offsets and data buffers of an Arrow string or binary array.
+    """
+    offsets = np.empty(nrows + 1, dtype=np.int64)
+    mask = np.empty(nrows, dtype=np.bool_)
+    p_offsets = ffi.from_buffer("int64_t*", offsets, require_writable=True)
+    if rcol.type == lib.monetdbe_str:
+        values = ffi.cast("char **", rcol.data)
+        lib.initialize_string_offsets_from_monetdbe(p_offsets, ffi.from_buffer("bool*", mask), nrows, values)
+        data = np.empty(offsets[-1], dtype=np.uint8)
+        lib.initialize_string_data_from_monetdbe(ffi.from_buffer("char*", data, require_writable=True), nrows,
+                                                 p_offsets, values)
+        arrow_type = pa.string()
+    else:
+        blobs = ffi.cast("monetdbe_data_blob *", rcol.data)
+        lib.initialize_blob_offsets_from_monetdbe(p_offsets, ffi.from_buffer("bool*", mask), nrows, blobs)
+        data = np.empty(offsets[-1], dtype=np.uint8)
+        lib.initialize_blob_data_from_monetdbe(ffi.from_buffer("char*", data, require_writable=True), nrows,
+                                               p_offsets, blobs)
+        arrow_type = pa.binary()
+
+    # only use 64 bit offsets if the data doesn't fit the regular string and binary types
+    if offsets[-1] < 2 ** 31:
+        offsets = offsets.astype(np.int32)
+    else:
+        arrow_type = pa.large_string() if arrow_type == pa.string() else pa.large_binary()
+    null_count = int(np.count_nonzero(mask))
+    validity = pa.py_buffer(np.packbits(~mask, bitorder='little')) if null_count else None
+    return pa.Array.from_buffers(arrow_type, nrows, [validity, pa.py_buffer(offsets), pa.py_buffer(data)],
+                                 null_count=null_count)
+
+
+def column_to_arrow(result: Result, rcol: monetdbe_column, nrows: int) -> pa.Array:
+    """
+    Convert a result column into an Arrow array. Integer and floating point columns are not copied, decimal, boolean,
+    date, time and timestamp columns are converted into new buffers.
+    """
+    type_info = monet_c_type_map[rcol.type]
+    if rcol.type in (lib.monetdbe_str, lib.monetdbe_blob):
+        return packed_column_to_arrow(rcol, nrows)
+    elif rcol.type == lib.monetdbe_date:
+        np_col = temporal_column_to_numpy(rcol, 0, nrows)
+        return numpy_to_arrow(pa.date32(), nrows, np_col.view(np.int64).astype(np.int32), np.isnat(np_col))
+    elif rcol.type == lib.monetdbe_time:
+        np_col = temporal_column_to_numpy(rcol, 0, nrows)
+        return numpy_to_arrow(pa.time32('ms'), nrows, np_col.view(np.int64).astype(np.int32), np.isnat(np_col))
+    elif rcol.type == lib.monetdbe_timestamp:
+        np_col = temporal_column_to_numpy(rcol, 0, nrows)
+        return numpy_to_arrow(pa.timestamp('ms'), nrows, np_col, np.isnat(np_col))
+    elif rcol.type == lib.monetdbe_bool or rcol.type in primitive_arrow_types:
+        np_col = np.asarray(ColumnBuffer(result, rcol, type_info.numpy_type, 0, nrows))
+        if rcol.type == lib.monetdbe_bool:
+            # the boolean null value is a byte that isn't 0 or 1, Arrow booleans are bits
+            raw = np_col.view(np.int8)
+            return numpy_to_arrow(pa.bool_(), nrows, np.packbits(raw == 1, bitorder='little'),
+                                  raw == get_null_value(rcol))
+        # the floating point null value is NaN, which doesn't compare equal to itself
+        mask = np.isnan(np_col) if np_col.dtype.kind == 'f' else np_col == get_null_value(rcol)
+        if is_decimal(rcol):
+            # a decimal128 is the unscaled value as a 128 bit little endian integer
+            unscaled = np.empty((nrows, 2), dtype=np.int64)
+            unscaled[:, 0] = np_col
+            unscaled[:, 1] = np.where(np_col < 0, -1, 0)
+            precision = rcol.sql_type.digits or 18
+            return numpy_to_arrow(pa.decimal128(precision, rcol.sql_type.scale), nrows, unscaled, mask)
+        return numpy_to_arrow(primitive_arrow_types[rcol.type], nrows, np_col, mask)
+    return pa.array([extract(rcol, r) for r in range(nrows)])
+
+
+def result_fetch_arrow(result: Result) -> pa.Table:
+    """
+    Convert all columns of a result into an Arrow table.
+    """
+    arrays = []
+    names = []
+    for c in range(result.ncols):
+        rcol = result.fetch(c)
+        names.append(make_string(rcol.name))
+        arrays.append(column_to_arrow(result, rcol, result.nrows))
+    return pa.Table.from_arrays(arrays, names=names)
+
+
+def arrow_to_numpy(array: Union[pa.Array, pa.ChunkedArray]) -> Union[np.ndarray, PackedValues]:
+    """
+    Convert an Arrow array into a value Internal.append() accepts. Strings and binary values are passed on as packed
+    values, numeric values without nulls are not copied.
+    """
+    if isinstance(array, pa.ChunkedArray):
+        array = array.combine_chunks()
+    if pa.types.is_dictionary(array.type):
+        array = array.dictionary_decode()
+    arrow_type = array.type
+    size = len(array)
+    mask = array.is_null().to_numpy(zero_copy_only=False)
+
+    if pa.types.is_string(arrow_type) or pa.types.is_large_string(arrow_type) or \
+            pa.types.is_binary(arrow_type) or pa.types.is_large_binary(arrow_type):
+        small = pa.types.is_string(arrow_type) or pa.types.is_binary(arrow_type)
+        offset_type = np.dtype(np.int32) if small else np.dtype(np.int64)
+        _, offsets_buffer, data_buffer = array.buffers()
+        offsets = np.frombuffer(offsets_buffer, dtype=offset_type)[array.offset:array.offset + size + 1]
+        data = np.frombuffer(data_buffer, dtype=np.uint8) if data_buffer else np.empty(0, dtype=np.uint8)
+        return PackedValues(data, offsets.astype(np.int64), mask)
+    elif pa.types.is_integer(arrow_type) or pa.types.is_floating(arrow_type):
+        values = np.frombuffer(array.buffers()[1], dtype=arrow_type.to_pandas_dtype())[array.offset:array.offset + size]
+        return np.ma.masked_array(values, mask=mask) if array.null_count else values
+    elif pa.types.is_boolean(arrow_type):
+        values = array.fill_null(False).to_numpy(zero_copy_only=False)
+        return np.ma.masked_array(values, mask=mask) if array.null_count else values
+    elif pa.types.is_decimal(arrow_type) and arrow_type.precision <= 18:
+        # the low 64 bits of a decimal128 hold the unscaled value, pass the scale on in the dtype metadata
+        words = np.frombuffer(array.buffers()[1], dtype=np.int64).reshape(-1, arrow_type.byte_width // 8)
+        scaled = words[array.offset:array.offset + size, 0].view(np.dtype(np.int64, metadata={'scale': arrow_type.scale}))  # type: ignore[call-overload]
+        return np.ma.masked_array(scaled, mask=mask)
+    elif pa.types.is_time(arrow_type):
+        ticks = array.view(pa.int32() if arrow_type.bit_width == 32 else pa.int64()).fill_null(0)
+        values = ticks.to_numpy().astype(f'timedelta64[{arrow_type.unit}]')
+        values[mask] = np.timedelta64('NaT')
+        return values
+    elif pa.types.is_timestamp(arrow_type) and arrow_type.tz is not None:
+        return array.cast(pa.timestamp(arrow_type.unit)).to_numpy(zero_copy_only=False)
+    return array.to_numpy(zero_copy_only=False)
+
+
+def arrow_to_numpy_dict(table: Union[pa.Table, pa.RecordBatch]) -> Dict[str, Union[np.ndarray, PackedValues]]:
+    return {name: arrow_to_numpy(column) for name, column in zip(table.column_names, table.columns)}
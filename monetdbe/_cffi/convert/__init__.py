@@ -22,11 +22,12 @@ def make_string(blob: char_p) -> str:
         return ""
 
 
-def make_blob(blob: char_p) -> str:
+def make_blob(blob: char_p) -> bytes:
     if blob:
-        return ffi.string(blob.data[0:blob.size])
+        # blobs can contain null bytes, so don't read them as a null terminated string
+        return ffi.unpack(blob.data, blob.size)
     else:
-        return ""
+        return b""
 
 
 def py_float(data: char_p) -> float:
@@ -120,6 +121,10 @@ def get_null_value(rcol: monetdbe_column):
     return col.null_value
 
 
+def is_decimal(rcol: monetdbe_column) -> bool:
+    return rcol.sql_type.name != ffi.NULL and ffi.string(rcol.sql_type.name).decode() == 'decimal'
+
+
 def extract(rcol: monetdbe_column, r: int, text_factory: Optional[Callable[[str], Any]] = None):
     """
     Extracts values from a monetdbe_column.
@@ -132,7 +137,7 @@ def extract(rcol: monetdbe_column, r: int, text_factory: Optional[Callable[[str]
         return None
     else:
         col_data = col.data[r]
-        if rcol.sql_type.name != ffi.NULL and ffi.string(rcol.sql_type.name).decode() == 'decimal':
+        if is_decimal(rcol):
             col_data = Decimal(col_data) / (Decimal(10) ** rcol.sql_type.scale)
         if type_info.py_converter:
             result = type_info.py_converter(col_data)
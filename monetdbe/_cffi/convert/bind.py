@@ -1,23 +1,12 @@
-from typing import Any, Union
-from decimal import Decimal
+from functools import partial
+from operator import index
+from typing import Any, Union, Callable, Dict
+from decimal import Decimal, InvalidOperation, ROUND_HALF_EVEN
 import datetime
-from monetdbe._lowlevel import ffi
+import numpy as np
+from monetdbe._lowlevel import ffi, lib
 
-
-def monetdbe_decimal_to_bte(data: int) -> ffi.CData:
-    return ffi.new("int8_t *", data)
-
-
-def monetdbe_decimal_to_sht(data: int) -> ffi.CData:
-    return ffi.new("int16_t *", data)
-
-
-def monetdbe_decimal_to_int(data: int) -> ffi.CData:
-    return ffi.new("int *", data)
-
-
-def monetdbe_decimal_to_lng(data: int) -> ffi.CData:
-    return ffi.new("int64_t *", data)
+binder_type = Callable[[Any], Union[bytes, ffi.CData]]
 
 
 def monetdbe_int(data: int) -> ffi.CData:
@@ -39,12 +28,16 @@ def bind_bytes(data: bytes) -> bytes:
     return f"{data.hex()}".encode()
 
 
-def bind_memoryview(data: memoryview) -> ffi.CData:
-    struct = ffi.new("monetdbe_data_blob *")
-    bytes_ = data.tobytes()
+def bind_blob(data: Union[bytes, bytearray, memoryview]) -> ffi.CData:
+    bytes_ = memoryview(data).tobytes()
+    # the struct and the data share one allocation, so the data lives as long as the returned object
+    header = ffi.sizeof("monetdbe_data_blob")
+    buffer = ffi.new("char[]", header + len(bytes_))
+    struct = ffi.cast("monetdbe_data_blob *", buffer)
     struct.size = len(bytes_)
-    struct.data = ffi.new("char []", bytes_)
-    return struct
+    struct.data = buffer + header
+    ffi.memmove(struct.data, bytes_, len(bytes_))
+    return buffer
 
 
 def bind_datetime(data: datetime.datetime) -> ffi.CData:
@@ -79,9 +72,8 @@ def bind_date(data: datetime.date) -> ffi.CData:
 def bind_timedelta(data: datetime.timedelta) -> ffi.CData:
     struct = ffi.new("monetdbe_data_time *")
     struct.ms = int(data.microseconds / 1000)
-    struct.seconds = data.seconds
-    struct.minutes = 0
-    struct.hours = 0
+    minutes, struct.seconds = divmod(data.seconds, 60)
+    struct.hours, struct.minutes = divmod(minutes, 60)
     return struct
 
 
@@ -94,7 +86,7 @@ map_ = {
     str: bind_str,
     float: bind_float,
     bytes: bind_bytes,
-    memoryview: bind_memoryview,
+    memoryview: bind_blob,
 }
 
 
@@ -106,3 +98,104 @@ def prepare_bind(data: Any) -> Union[str, ffi.CData]:
             if isinstance(data, type_):
                 return func(data)  # type: ignore[operator]
         raise NotImplementedError(f"bind converting for type {type(data)}")
+
+
+def bind_integer(c_type: str, data: Any) -> ffi.CData:
+    return ffi.new(c_type, index(data))
+
+
+def bind_bool(data: Any) -> ffi.CData:
+    if not isinstance(data, (int, np.integer, np.bool_)):
+        raise TypeError(f"can't bind {type(data)} to a boolean")
+    return ffi.new("int8_t *", bool(data))
+
+
+def bind_real(c_type: str, data: Any) -> ffi.CData:
+    return ffi.new(c_type, data)
+
+
+def bind_decimal(c_type: str, scale: int, data: Any) -> ffi.CData:
+    if isinstance(data, np.generic):
+        data = data.item()
+    if isinstance(data, float):
+        # the shortest repr, so 1.15 is not bound as 1.149999...
+        data = str(data)
+    try:
+        value = (Decimal(data) * (Decimal(10) ** scale)).to_integral_value(ROUND_HALF_EVEN)
+    except InvalidOperation as e:
+        raise ValueError(f"can't bind {data!r} to a decimal") from e
+    return ffi.new(c_type, int(value))
+
+
+def bind_text(data: Any) -> ffi.CData:
+    if isinstance(data, (bytes, bytearray, memoryview)):
+        raise TypeError("can't bind binary data to a string")
+    return bind_str(data)
+
+
+def bind_date_value(data: Any) -> Union[bytes, ffi.CData]:
+    if isinstance(data, np.datetime64):
+        data = data.astype('datetime64[D]').item()
+        if data is None:
+            return ffi.NULL
+    return bind_date(data)
+
+
+def bind_time_value(data: Any) -> Union[bytes, ffi.CData]:
+    if isinstance(data, np.timedelta64):
+        data = data.astype('timedelta64[us]').item()
+        if data is None:
+            return ffi.NULL
+    if isinstance(data, datetime.timedelta):
+        return bind_timedelta(data)
+    return bind_time(data)
+
+
+def bind_timestamp_value(data: Any) -> Union[bytes, ffi.CData]:
+    if isinstance(data, np.datetime64):
+        data = data.astype('datetime64[us]').item()
+        if data is None:
+            return ffi.NULL
+    elif not isinstance(data, datetime.datetime):
+        # a date is midnight of that day
+        data = datetime.datetime(data.year, data.month, data.day)
+    return bind_datetime(data)
+
+
+# the monetdbe type of a parameter -> the function that converts a value for it
+type_binders: Dict[int, binder_type] = {
+    lib.monetdbe_bool: bind_bool,
+    lib.monetdbe_int8_t: partial(bind_integer, "int8_t *"),
+    lib.monetdbe_int16_t: partial(bind_integer, "int16_t *"),
+    lib.monetdbe_int32_t: partial(bind_integer, "int32_t *"),
+    lib.monetdbe_int64_t: partial(bind_integer, "int64_t *"),
+    lib.monetdbe_size_t: partial(bind_integer, "size_t *"),
+    lib.monetdbe_float: partial(bind_real, "float *"),
+    lib.monetdbe_double: partial(bind_real, "double *"),
+    lib.monetdbe_str: bind_text,
+    lib.monetdbe_blob: bind_blob,
+    lib.monetdbe_date: bind_date_value,
+    lib.monetdbe_time: bind_time_value,
+    lib.monetdbe_timestamp: bind_timestamp_value,
+}
+
+# the implementation type of a decimal parameter -> the C type of its unscaled value
+decimal_c_types = {
+    'bte': "int8_t *",
+    'sht': "int16_t *",
+    'int': "int32_t *",
+    'lng': "int64_t *",
+}
+
+
+def parameter_binder(monetdbe_type: int, sql_type: str, impl_type: str, scale: int) -> binder_type:
+    """
+    Choose the function that converts the values of a parameter of a prepared statement, based on the type the
+    statement declares for it. Values are converted to exactly that type, whatever their python or numpy type is.
+    Parameters of types without a binder are converted based on the type of the value.
+    """
+    if sql_type == 'decimal':
+        if impl_type not in decimal_c_types:
+            raise NotImplementedError("Unknown decimal implementation type")
+        return partial(bind_decimal, decimal_c_types[impl_type], scale)
+    return type_binders.get(monetdbe_type, prepare_bind)
@@ -1,15 +1,19 @@
 import logging
-from _warnings import warn
+import re
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
-from typing import Optional, Tuple, Any, Mapping, Iterator, Dict, TYPE_CHECKING
+from typing import Optional, Tuple, Any, Mapping, Iterator, Dict, List, Callable, NamedTuple, Union, TYPE_CHECKING
+from datetime import time, timedelta
 from decimal import Decimal
 from collections import namedtuple
+from weakref import WeakSet
 
 import numpy as np
 from monetdbe._lowlevel import ffi, lib
 from monetdbe import exceptions
-from monetdbe._cffi.convert import make_string, monet_c_type_map, extract, numpy_monetdb_map, precision_warning, timestamp_to_date, get_null_value
-from monetdbe._cffi.convert.bind import monetdbe_decimal_to_bte, monetdbe_decimal_to_sht, monetdbe_decimal_to_int, monetdbe_decimal_to_lng, prepare_bind
+from monetdbe._cffi.convert import make_string, monet_c_type_map, extract, numpy_monetdb_map, precision_warning, timestamp_to_date, get_null_value, is_decimal
+from monetdbe._cffi.convert.bind import parameter_binder
 from monetdbe._cffi.errors import check_error
 from monetdbe._cffi.types_ import monetdbe_result, monetdbe_database, monetdbe_column, monetdbe_statement
 from monetdbe._cffi.branch import newer_then_dec2023
@@ -19,6 +23,10 @@ if TYPE_CHECKING:
 
 _logger = logging.getLogger(__name__)
 
+# statements that may change what a cached prepared statement refers to
+invalidates_statements = re.compile(
+    r"(^|;)\s*(create|drop|alter|comment|grant|revoke|truncate|rename|rollback|set)\b", flags=re.IGNORECASE)
+
 
 def result_fetch(result: monetdbe_result, column: int) -> monetdbe_column:
     p_rcol = ffi.new("monetdbe_column **")
@@ -26,37 +34,421 @@ def result_fetch(result: monetdbe_result, column: int) -> monetdbe_column:
     return p_rcol[0]
 
 
-def result_fetch_numpy(result: monetdbe_result) -> Mapping[str, np.ndarray]:
-    result_dict: Dict[str, np.ndarray] = {}
-    for c in range(result.ncols):
-        rcol = result_fetch(result, c)
-        name = make_string(rcol.name)
-        type_info = monet_c_type_map[rcol.type]
-
-        np_mask = np.ma.nomask  # type: ignore[attr-defined]
-        # for non float/int we for now first make a numpy object array which we then convert to the right numpy type
-        if type_info.numpy_type.type == np.object_:
-            values = [extract(rcol, r) for r in range(result.nrows)]
-            np_col: np.ndarray = np.array(values)
-            np_mask = np.array([v is None for v in values])  # type: ignore
-            if rcol.type == lib.monetdbe_str:
-                np_col = np_col.astype(str)
-            elif rcol.type == lib.monetdbe_date:
-                np_col = np_col.astype('datetime64[D]')  # type: ignore
-            elif rcol.type == lib.monetdbe_time:
-                warn("Not converting column with type column since no proper numpy equivalent")
-            elif rcol.type == lib.monetdbe_timestamp:
-                np_col = np_col.astype('datetime64[ms]')  # type: ignore
+class Result:
+    """
+    Owns a monetdbe_result. The result is cleaned up once the handle is garbage collected, and numpy arrays that view
+    the result data keep the handle alive through their base. Arrays created from a result can therefore be used
+    without copying, also after the connection is closed: the database is only closed once the last handle is gone.
+    """
+
+    def __init__(self, internal: 'Internal', result: monetdbe_result):
+        self._internal = internal
+        self.result = result
+        internal._results.add(self)
+
+    def __del__(self):
+        self.cleanup()
+
+    def __bool__(self) -> bool:
+        return bool(self.result)
+
+    @property
+    def nrows(self) -> int:
+        return self.result.nrows
+
+    @property
+    def ncols(self) -> int:
+        return self.result.ncols
+
+    def fetch(self, column: int) -> monetdbe_column:
+        return result_fetch(self.result, column)
+
+    def cleanup(self) -> None:
+        if self.result:
+            result, self.result = self.result, None
+            self._internal._results.discard(self)
+            self._internal.cleanup_result(result)
+
+
+class ColumnBuffer:
+    """
+    Exposes the data of a numeric result column to numpy without copying. Arrays created from this buffer keep the
+    Result that owns the data alive.
+    """
+
+    def __init__(self, result: Result, rcol: monetdbe_column, dtype: np.dtype, start: int, nrows: int):
+        self.result = result
+        self.__array_interface__ = {
+            'shape': (nrows,),
+            'typestr': dtype.str,
+            'data': (int(ffi.cast("uintptr_t", rcol.data)) + start * dtype.itemsize, False),
+            'version': 3,
+        }
+
+
+def string_column_to_numpy(rcol: monetdbe_column, start: int, nrows: int) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Convert nrows of a monetdbe string column, starting at row start, into a fixed width numpy unicode array and a
+    null mask.
+    """
+    data = ffi.cast("char **", rcol.data) + start
+    np_mask = np.empty(nrows, dtype=np.bool_)
+    width = lib.initialize_string_mask_from_monetdbe(ffi.from_buffer("bool*", np_mask), nrows, data)
+    np_col = np.zeros(nrows, dtype=f'U{max(width, 1)}')
+    p = ffi.from_buffer("uint32_t*", np_col, require_writable=True)
+    lib.initialize_numpy_string_array_from_monetdbe(p, nrows, max(width, 1), data)
+    return np_col, np_mask
+
+
+def string_column_to_python(rcol: monetdbe_column, start: int, nrows: int) -> Tuple[List[Optional[str]], np.ndarray]:
+    """
+    Convert nrows of a monetdbe string column, starting at row start, into a list of python strings with None for null,
+    and a null mask.
+    The strings are copied into a single UTF-8 buffer, so unlike with string_column_to_numpy() one long value doesn't
+    widen all the others.
+    """
+    data = ffi.cast("char **", rcol.data) + start
+    offsets = np.empty(nrows + 1, dtype=np.int64)
+    np_mask = np.empty(nrows, dtype=np.bool_)
+    p_offsets = ffi.from_buffer("int64_t*", offsets, require_writable=True)
+    lib.initialize_string_offsets_from_monetdbe(p_offsets, ffi.from_buffer("bool*", np_mask), nrows, data)
+    utf8 = bytearray(int(offsets[-1]))
+    lib.initialize_string_data_from_monetdbe(ffi.from_buffer("char*", utf8, require_writable=True), nrows, p_offsets,
+                                             data)
+    bounds = offsets.tolist()
+    nulls = np_mask.tolist()
+    return [None if nulls[i] else utf8[bounds[i]:bounds[i + 1]].decode() for i in range(nrows)], np_mask
+
+
+temporal_numpy_types = {
+    lib.monetdbe_date: ('date', 'datetime64[D]', lib.initialize_numpy_date_array_from_monetdbe),
+    lib.monetdbe_time: ('time', 'timedelta64[ms]', lib.initialize_numpy_time_array_from_monetdbe),
+    lib.monetdbe_timestamp: ('timestamp', 'datetime64[ms]', lib.initialize_numpy_timestamp_array_from_monetdbe),
+}
+
+
+def temporal_column_to_numpy(rcol: monetdbe_column, start: int, nrows: int) -> np.ndarray:
+    """
+    Convert nrows of a monetdbe date, time or timestamp column, starting at row start, into a numpy datetime64[D],
+    timedelta64[ms] or datetime64[ms] array. Null values become NaT.
+    """
+    c_string_type, numpy_type, initialize = temporal_numpy_types[rcol.type]
+    col = ffi.cast(f"monetdbe_column_{c_string_type} *", rcol)
+    np_col = np.empty(nrows, dtype=numpy_type)
+    initialize(ffi.from_buffer("int64_t*", np_col, require_writable=True), nrows, col.data + start, col.null_value)
+    return np_col
+
+
+decimal_options = ('float64', 'int_scaled', 'object')
+
+
+def decimal_column_to_numpy(np_col: np.ndarray, scale: int, decimal: str) -> np.ndarray:
+    """
+    Convert the unscaled integers of a decimal column.
+
+    Args:
+        np_col: the unscaled integers
+        scale: the scale of the decimal column
+        decimal: 'float64' to return the scaled values as floats, 'int_scaled' to return the unscaled integers with the
+                 scale stored in the dtype metadata as 'scale', or 'object' to return exact python Decimal objects.
+    """
+    if decimal == 'float64':
+        return np_col / float(10 ** scale)
+    elif decimal == 'int_scaled':
+        return np_col.view(np.dtype(np_col.dtype, metadata={'scale': scale}))  # type: ignore[call-overload]
+    elif decimal == 'object':
+        divisor = Decimal(10) ** scale
+        return np.array([Decimal(v) / divisor for v in np_col.tolist()], dtype=object)
+    raise ValueError(f"decimal should be one of {', '.join(decimal_options)}, not '{decimal}'")
+
+
+def column_to_numpy(result: Result, rcol: monetdbe_column, start: int, nrows: int, decimal: str) -> np.ndarray:
+    """
+    Convert nrows of a result column, starting at row start, into a masked numpy array.
+    """
+    type_info = monet_c_type_map[rcol.type]
+
+    if rcol.type == lib.monetdbe_str:
+        np_col, np_mask = string_column_to_numpy(rcol, start, nrows)
+    elif rcol.type in temporal_numpy_types:
+        np_col = temporal_column_to_numpy(rcol, start, nrows)
+        np_mask = np.isnat(np_col)
+    # for other non float/int we for now make a numpy object array
+    elif type_info.numpy_type.type == np.object_:
+        values = [extract(rcol, r) for r in range(start, start + nrows)]
+        np_col = np.array(values)
+        np_mask = np.array([v is None for v in values])  # type: ignore
+    else:
+        np_col = np.asarray(ColumnBuffer(result, rcol, type_info.numpy_type, start, nrows))
+        # the boolean null value is a byte that isn't 0 or 1, compare the raw bytes
+        np_mask = (np_col.view(np.int8) if rcol.type == lib.monetdbe_bool else np_col) == get_null_value(rcol)
+        if is_decimal(rcol):
+            np_col = decimal_column_to_numpy(np_col, rcol.sql_type.scale, decimal)
+
+    return np.ma.masked_array(np_col, mask=np_mask)
+
+
+def result_fetch_numpy(result: Result, start: int = 0, stop: Optional[int] = None,
+                       decimal: str = 'float64', threads: Optional[int] = None) -> Mapping[str, np.ndarray]:
+    """
+    Convert all columns of a result into masked numpy arrays. Numeric columns are not copied, they view the result
+    data directly.
+
+    Args:
+        result: the result to convert
+        start: the first row to convert
+        stop: convert up to, but not including, this row. Defaults to all rows.
+        decimal: how to convert decimal columns, see decimal_column_to_numpy()
+        threads: convert the columns in parallel on this many threads. The native conversion of string and temporal
+                 columns releases the GIL.
+    """
+    if decimal not in decimal_options:
+        raise ValueError(f"decimal should be one of {', '.join(decimal_options)}, not '{decimal}'")
+    if threads is not None and threads < 1:
+        raise ValueError("threads should be a positive number")
+    stop = result.nrows if stop is None else min(stop, result.nrows)
+    nrows = max(stop - start, 0)
+    rcols = [result.fetch(c) for c in range(result.ncols)]
+    names = [make_string(rcol.name) for rcol in rcols]
+
+    def convert(rcol: monetdbe_column) -> np.ndarray:
+        return column_to_numpy(result, rcol, start, nrows, decimal)
+
+    if threads is None or threads == 1 or len(rcols) < 2:
+        return dict(zip(names, map(convert, rcols)))
+    with ThreadPoolExecutor(max_workers=min(threads, len(rcols))) as executor:
+        return dict(zip(names, executor.map(convert, rcols)))
+
+
+# the number of rows converted at once when iterating over the rows of a result
+fetch_chunk_size = 4096
+
+
+def column_to_python(rcol: monetdbe_column, start: int, nrows: int,
+                     text_factory: Optional[Callable[[str], Any]] = None) -> List[Any]:
+    """
+    Convert nrows of a result column, starting at row start, into a list of python values. This gives the same values
+    as calling extract() for each row, but converts the whole slice at once.
+    """
+    type_info = monet_c_type_map[rcol.type]
+    values: List[Any]
+
+    if rcol.type == lib.monetdbe_str:
+        values, np_mask = string_column_to_python(rcol, start, nrows)
+        if text_factory:
+            values = [None if v is None else text_factory(v) for v in values]
+    elif rcol.type == lib.monetdbe_time:
+        np_col = temporal_column_to_numpy(rcol, start, nrows)
+        np_mask = np.isnat(np_col)
+        ms = np.where(np_mask, 0, np_col.view(np.int64))
+        hours, ms = np.divmod(ms, 3600000)
+        minutes, ms = np.divmod(ms, 60000)
+        seconds, ms = np.divmod(ms, 1000)
+        values = [time(*t) for t in zip(hours.tolist(), minutes.tolist(), seconds.tolist(), (ms * 1000).tolist())]
+    elif rcol.type in temporal_numpy_types:
+        np_col = temporal_column_to_numpy(rcol, start, nrows)
+        np_mask = np.isnat(np_col)
+        values = np_col.tolist()
+    elif type_info.numpy_type.type == np.object_:
+        return [extract(rcol, r, text_factory) for r in range(start, start + nrows)]
+    else:
+        # booleans are stored as bytes, read them like extract() does so we can compare them with the null value
+        numpy_type = np.dtype(np.int8) if rcol.type == lib.monetdbe_bool else type_info.numpy_type
+        c_buffer = ffi.buffer(ffi.cast("char *", rcol.data) + start * numpy_type.itemsize, nrows * numpy_type.itemsize)
+        np_col = np.frombuffer(c_buffer, dtype=numpy_type)  # type: ignore
+        if rcol.type in (lib.monetdbe_float, lib.monetdbe_double):
+            np_mask = np.isnan(np_col)
         else:
-            buffer_size = result.nrows * type_info.numpy_type.itemsize  # type: ignore
-            c_buffer = ffi.buffer(rcol.data, buffer_size)
-            np_col = np.frombuffer(c_buffer, dtype=type_info.numpy_type)  # type: ignore
             np_mask = np_col == get_null_value(rcol)
 
-        masked: np.ndarray = np.ma.masked_array(np_col, mask=np_mask)
-
-        result_dict[name] = masked
-    return result_dict
+        if is_decimal(rcol):
+            divisor = Decimal(10) ** rcol.sql_type.scale
+            values = [Decimal(v) / divisor for v in np_col.tolist()]
+        elif type_info.py_converter:
+            values = [type_info.py_converter(v) for v in np_col.tolist()]
+        else:
+            values = np_col.tolist()
+
+    for r in np.flatnonzero(np_mask).tolist():
+        values[r] = None
+    return values
+
+
+def result_fetch_rows(result: Result, text_factory: Optional[Callable[[str], Any]] = None) -> Iterator[Tuple]:
+    """
+    Iterate over the rows of a result as tuples. The result is converted column by column, one chunk of
+    fetch_chunk_size rows at a time.
+    """
+    columns = list(map(result.fetch, range(result.ncols)))
+    for start in range(0, result.nrows, fetch_chunk_size):
+        nrows = min(fetch_chunk_size, result.nrows - start)
+        yield from zip(*(column_to_python(rcol, start, nrows, text_factory) for rcol in columns))
+
+
+def numpy_to_decimal_column(values: np.ndarray, scale: int, numpy_type: np.dtype) -> np.ndarray:
+    """
+    Convert values to the unscaled integers of a decimal column, masked where a value is null. Integer arrays with the
+    column scale in their dtype metadata, as returned by fetchnumpy(decimal='int_scaled'), are already unscaled.
+    """
+    mask = np.ma.getmaskarray(values)
+    data = np.ma.getdata(values)
+    multiplier = 10 ** scale
+    if data.dtype.kind in 'iub':
+        # integers that carry a scale are unscaled already, only the difference in scale has to be applied
+        data_scale = (data.dtype.metadata or {}).get('scale', 0)  # type: ignore[call-overload]
+        unscaled = data.astype(numpy_type)
+        if scale >= data_scale:
+            unscaled = unscaled * 10 ** (scale - data_scale)
+        else:
+            # round half to even, like the other conversions
+            divisor = 10 ** (data_scale - scale)
+            quotient, remainder = np.divmod(unscaled, divisor)
+            unscaled = quotient + ((2 * remainder > divisor) | ((2 * remainder == divisor) & (quotient % 2 == 1)))
+    elif data.dtype.kind == 'f':
+        mask = mask | np.isnan(data)
+        unscaled = np.rint(np.where(mask, 0, data) * multiplier).astype(numpy_type)
+    else:
+        objects = data.tolist()
+        mask = mask | np.array([v is None for v in objects], dtype=np.bool_)
+        decimal_multiplier = Decimal(multiplier)
+        unscaled = np.array([0 if m else int((Decimal(v) * decimal_multiplier).to_integral_value())
+                             for v, m in zip(objects, mask)], dtype=numpy_type)
+    return np.ma.masked_array(unscaled, mask=mask)
+
+
+# the numpy type python objects are converted to before they are appended to a column, and the value for null
+object_numpy_types = {
+    lib.monetdbe_date: (np.dtype('datetime64[D]'), None),
+    lib.monetdbe_time: (np.dtype('timedelta64[us]'), None),
+    lib.monetdbe_timestamp: (np.dtype('datetime64[us]'), None),
+}
+
+
+def objects_to_numpy(values: np.ndarray, existing_type: int) -> np.ndarray:
+    """
+    Convert an array of python objects, with None for null, to a numpy array that can be appended to a column of
+    type existing_type. Null becomes NaT for temporal types, and is masked otherwise.
+    """
+    objects = np.ma.getdata(values).tolist()
+    mask = np.ma.getmaskarray(values) | np.array([v is None for v in objects], dtype=np.bool_)
+    numpy_type, null = object_numpy_types.get(existing_type, (monet_c_type_map[existing_type].numpy_type, 0))
+    if existing_type == lib.monetdbe_time:
+        objects = [timedelta(hours=v.hour, minutes=v.minute, seconds=v.second, microseconds=v.microsecond)
+                   if isinstance(v, time) else v for v in objects]
+    array = np.array([null if m else v for v, m in zip(objects, mask)], dtype=numpy_type)
+    if numpy_type.kind in 'Mm':
+        return array
+    return np.ma.masked_array(array, mask=mask)
+
+
+class PackedValues(NamedTuple):
+    """
+    Variable length strings or bytes packed one after the other, the layout of Arrow string and binary arrays. Value i
+    is data[offsets[i]:offsets[i + 1]], values are null where mask is set.
+    """
+    data: np.ndarray
+    offsets: np.ndarray
+    mask: np.ndarray
+
+    @property
+    def shape(self) -> Tuple[int]:
+        return (len(self.mask),)
+
+
+def slice_column(values: Union[np.ndarray, PackedValues], start: int, stop: int) -> Union[np.ndarray, PackedValues]:
+    """
+    Take rows start up to stop of an appended column, without copying.
+    """
+    if isinstance(values, PackedValues):
+        return PackedValues(values.data, values.offsets[start:stop + 1], values.mask[start:stop])
+    return values[start:stop]
+
+
+def null_mask(values: Union[np.ndarray, PackedValues]) -> np.ndarray:
+    """
+    The rows of a column that are null: masked, NaT or None.
+    """
+    if isinstance(values, PackedValues):
+        return values.mask
+    mask = np.ma.getmaskarray(values)
+    data = np.ma.getdata(values)
+    if data.dtype.kind in 'Mm':
+        mask = mask | np.isnat(data)
+    elif data.dtype.kind == 'O':
+        mask = mask | np.array([v is None for v in data.tolist()], dtype=np.bool_)
+    return mask
+
+
+def objects_to_packed(values: np.ndarray, encode: Callable[[Any], bytes]) -> PackedValues:
+    """
+    Pack an array of python objects, with None for null, using encode to convert every value to bytes.
+    """
+    objects = np.ma.getdata(values).tolist()
+    mask = np.ma.getmaskarray(values) | np.array([v is None for v in objects], dtype=np.bool_)
+    parts = [b'' if m else encode(v) for v, m in zip(objects, mask)]
+    offsets = np.zeros(len(parts) + 1, dtype=np.int64)
+    np.cumsum([len(part) for part in parts], out=offsets[1:])
+    return PackedValues(np.frombuffer(b''.join(parts), dtype=np.uint8), offsets, mask)
+
+
+def numpy_to_string_column(values: Union[np.ndarray, PackedValues], cffi_objects: List) -> Any:
+    """
+    Pack an array of strings (unicode, python objects with None for null, or packed UTF-8) into one buffer of null
+    terminated UTF-8 strings, and create the monetdbe string column data that points into it. Unlike the fixed width
+    numpy unicode array, the buffer is only as large as the strings it contains. The buffers are added to
+    cffi_objects, keep them alive until the data is appended.
+    """
+    if not isinstance(values, PackedValues) and values.dtype.kind == 'O':
+        values = objects_to_packed(values, lambda v: (v if isinstance(v, str) else str(v)).encode())
+    if isinstance(values, PackedValues):
+        size = len(values.mask)
+        data = values.data[values.offsets[0]:values.offsets[-1]]
+        if np.any(data == 0):
+            raise ValueError("strings can't contain null characters")
+        t = ffi.new('char*[]', size)
+        buffer = ffi.new('char[]', len(data) + size + 1)
+        offsets = np.ascontiguousarray(values.offsets, dtype=np.int64)
+        mask = np.ascontiguousarray(values.mask, dtype=np.bool_)
+        cffi_objects.extend((values, offsets, mask, t, buffer))
+        lib.initialize_string_array_from_offsets(t, size, ffi.from_buffer("char[]", values.data), ffi.from_buffer("int64_t*", offsets),
+                                                 buffer, ffi.from_buffer("bool*", mask))
+        return t
+
+    mask = np.ma.getmaskarray(values)
+    data = np.ma.getdata(values)
+    size = len(data)
+    t = ffi.new('char*[]', size)
+    cffi_objects.extend((mask, t))
+    if not size:
+        return t
+
+    if data.dtype.kind == 'U':
+        data = np.ascontiguousarray(data)
+        width = data.dtype.itemsize // 4
+        p_data = ffi.from_buffer("uint32_t*", data)
+        buffer = ffi.new('char[]', lib.utf8_size_of_numpy_string_array(p_data, size, width))
+        cffi_objects.extend((data, buffer))
+    lib.initialize_string_array_from_numpy(t, size, width, p_data, buffer, ffi.from_buffer("bool*", mask))
+    return t
+
+
+def numpy_to_blob_column(values: Union[np.ndarray, PackedValues], cffi_objects: List) -> Any:
+    """
+    Pack an array of bytes (or python objects with None for null) into one buffer, and create the monetdbe blob column
+    data that points into it. Packed values are used without copying. The buffers are added to cffi_objects, keep them
+    alive until the data is appended.
+    """
+    if not isinstance(values, PackedValues):
+        values = objects_to_packed(values, bytes)
+    size = len(values.mask)
+    offsets = np.ascontiguousarray(values.offsets, dtype=np.int64)
+    mask = np.ascontiguousarray(values.mask, dtype=np.bool_)
+    p_buffer = ffi.from_buffer("char[]", values.data)
+    t = ffi.new('monetdbe_data_blob[]', size)
+    cffi_objects.extend((values, p_buffer, offsets, mask, t))
+    lib.initialize_blob_array_from_numpy(t, size, p_buffer, ffi.from_buffer("int64_t*", offsets),
+                                         ffi.from_buffer("bool*", mask))
+    return t
 
 
 def get_autocommit() -> bool:
@@ -65,30 +457,29 @@ def get_autocommit() -> bool:
     return bool(value[0])
 
 
-TypeInfo = namedtuple('TypeInfo', ('impl_type', 'sql_type', 'scale'))
+# binder converts a value to the type the prepared statement declares for the parameter
+TypeInfo = namedtuple('TypeInfo', ('impl_type', 'sql_type', 'scale', 'binder'))
+
 
+def bind(statement: monetdbe_statement, data: Any, parameter_nr: int, type_info=None) -> Any:
+    """
+    Bind a parameter to a prepared statement.
 
-def bind(statement: monetdbe_statement, data: Any, parameter_nr: int, type_info=None) -> None:
+    returns:
+        the cffi object holding the bound value, keep it alive until the statement is executed
+    """
     try:
-        _type_info = type_info[parameter_nr]
-        if _type_info.sql_type == 'decimal':
-            d = int(Decimal(data) * (Decimal(10) ** _type_info.scale))
-            if _type_info.impl_type == 'bte':
-                prepared = monetdbe_decimal_to_bte(d)
-            elif _type_info.impl_type == 'sht':
-                prepared = monetdbe_decimal_to_sht(d)
-            elif _type_info.impl_type == 'int':
-                prepared = monetdbe_decimal_to_int(d)
-            elif _type_info.impl_type == 'lng':
-                prepared = monetdbe_decimal_to_lng(d)
-            else:
-                raise NotImplementedError("Unknown decimal implementation type")
-        else:
-            prepared = prepare_bind(data)
+        binder = type_info[parameter_nr].binder
     except IndexError as e:
-        from monetdbe import exceptions
         raise exceptions.ProgrammingError from e
+    try:
+        prepared = ffi.NULL if data is None else binder(data)
+    except OverflowError as e:
+        raise exceptions.DataError(f"Parameter {parameter_nr} is out of range for its type") from e
+    except (TypeError, ValueError, AttributeError, NotImplementedError) as e:
+        raise exceptions.InterfaceError(f"Error binding parameter {parameter_nr} - probably unsupported type") from e
     check_error(lib.monetdbe_bind(statement, prepared, parameter_nr))
+    return prepared
 
 
 def execute(statement: monetdbe_statement, make_result: bool = False) -> Tuple[monetdbe_result, int]:
@@ -129,8 +520,13 @@ class Internal:
             mapi_server_host: Optional[str] = None,
             mapi_server_usock: Optional[Path] = None,
             mapi_server_port: Optional[int] = None,
+            cached_statements: int = 128,
     ):
         self._connection = connection
+        self.cached_statements = cached_statements
+        self._statement_cache: 'OrderedDict[str, Tuple[monetdbe_statement, List[TypeInfo]]]' = OrderedDict()
+        self._results: 'WeakSet[Result]' = WeakSet()
+        self._close_pending = False
         self.dbdir = dbdir
         self.memorylimit = memorylimit
         self.querytimeout = querytimeout
@@ -161,11 +557,30 @@ class Internal:
 
         self.set_active_context(self)
 
-    def cleanup_result(self, result: monetdbe_result):
+    def execute(self, statement: monetdbe_statement, make_result: bool = False) -> Tuple[Optional[Result], int]:
+        """
+        Execute a prepared statement.
+
+        Args:
+            statement: the prepared statement, with all parameters bound
+            make_result: Create and return a result object.
+
+        returns:
+            result, affected_rows
+        """
         self._switch()
-        _logger.info("cleanup_result called")
-        if result and self._monetdbe_database:
-            check_error(lib.monetdbe_cleanup_result(self._monetdbe_database, result))
+        result, affected_rows = execute(statement, make_result)
+        return (Result(self, result) if make_result else None), affected_rows
+
+    def cleanup_result(self, result: monetdbe_result):
+        # results are cleaned up when they are garbage collected, which can happen in any thread
+        with self._connection._lock:
+            self._switch()
+            _logger.info("cleanup_result called")
+            if result and self._monetdbe_database:
+                check_error(lib.monetdbe_cleanup_result(self._monetdbe_database, result))
+            if self._close_pending and not self._results:
+                self._close_database()
 
     def open(self) -> monetdbe_database:
 
@@ -239,21 +654,31 @@ class Internal:
     def close(self) -> None:
         self._switch()
         if self._monetdbe_database:
-            if lib.monetdbe_close(self._monetdbe_database):
-                raise exceptions.OperationalError("Failed to close database")
-            self.set_monetdbe_database(None)
+            self.clear_statement_cache()
+            if self._results:
+                # numpy arrays and Arrow tables may still view the data of these results, the database is closed
+                # when the last of them is cleaned up
+                self._close_pending = True
+            else:
+                self._close_database()
 
         if self._active_context:
             self.set_active_context(None)
 
-    def query(self, query: str, make_result: bool = False) -> Tuple[Optional[Any], int]:
+    def _close_database(self) -> None:
+        self._close_pending = False
+        if lib.monetdbe_close(self._monetdbe_database):
+            raise exceptions.OperationalError("Failed to close database")
+        self.set_monetdbe_database(None)
+
+    def query(self, query: str, make_result: bool = False) -> Tuple[Optional[Result], int]:
         """
         Execute a query.
 
         Args:
             query: the query
-            make_result: Create and return a result object. If enabled, you need to call cleanup_result on the
-                          result afterwards
+            make_result: Create and return a result object. The result is cleaned up when the returned handle is
+                          garbage collected, or when its cleanup() method is called.
 
         returns:
             result, affected_rows
@@ -265,11 +690,15 @@ class Internal:
         else:
             p_result = ffi.NULL
 
+        if invalidates_statements.search(query):
+            self.clear_statement_cache()
+
         affected_rows = ffi.new("monetdbe_cnt *")
+        # cffi releases the GIL for the duration of every call into the library
         check_error(lib.monetdbe_query(self._monetdbe_database, query.encode(), p_result, affected_rows))
 
         if make_result:
-            result = p_result[0]
+            result = Result(self, p_result[0])
         else:
             result = None
 
@@ -283,25 +712,113 @@ class Internal:
         self._switch()
         return bool(lib.monetdbe_in_transaction(self._monetdbe_database))
 
-    def append(self, table: str, data: Mapping[str, np.ndarray], schema: str = 'sys') -> None:
+    def append(self, table: str, data: Mapping[str, Union[np.ndarray, PackedValues]], schema: str = 'sys',
+               chunk_size: Optional[int] = None) -> None:
         """
-        Directly append an array structure
+        Directly append an array structure.
+
+        Besides numeric, unicode and datetime64 arrays, object arrays (with None for null) of str, bytes, Decimal,
+        date, time and datetime values, bytes arrays and timedelta64 arrays are converted to the type of the column
+        they are appended to. Masked values become null. String and blob columns also accept packed values.
+
+        With a chunk_size, the rows are converted and appended chunk_size rows at a time, so only two chunks of
+        converted columns are in memory at once. The next chunk is converted on a worker thread while the current one
+        is appended. All chunks are appended in one transaction.
         """
         self._switch()
-        n_columns = len(data)
-        existing_columns = list(self.get_columns(schema=schema, table=table))
-        existing_names, existing_types = zip(*existing_columns)
+        existing_columns = [(ffi.string(rcol.name).decode(), rcol.type, rcol.sql_type.scale if is_decimal(rcol) else None)
+                            for rcol in self._get_columns(schema=schema, table=table)]
+        existing_names, existing_types, _ = zip(*existing_columns)
         if not set(existing_names) == set(data.keys()):
             error = f"Appended column names ({', '.join(str(i) for i in data.keys())}) " \
                 f"don't match existing column names ({', '.join(existing_names)})"
             raise exceptions.ProgrammingError(error)
 
+        sizes = {values.shape[0] for values in data.values()}
+        size = max(sizes)
+        if chunk_size is None or size <= chunk_size:
+            work_columns, keep_alive = self._convert_columns(existing_columns, data, 0, size)
+            check_error(lib.monetdbe_append(self._monetdbe_database, schema.encode(),
+                                            table.encode(), work_columns, len(existing_columns)))
+            return
+
+        if chunk_size < 1:
+            raise ValueError("chunk_size should be a positive number")
+        if len(sizes) > 1:
+            raise exceptions.ProgrammingError("Appended columns don't have the same number of rows")
+
+        in_transaction = self.in_transaction()
+        if not in_transaction:
+            self.query("start transaction")
+        try:
+            with ThreadPoolExecutor(max_workers=1) as executor:
+                pending = executor.submit(self._convert_columns, existing_columns, data, 0, chunk_size)
+                for start in range(0, size, chunk_size):
+                    work_columns, keep_alive = pending.result()
+                    if start + chunk_size < size:
+                        pending = executor.submit(self._convert_columns, existing_columns, data,
+                                                  start + chunk_size, start + 2 * chunk_size)
+                    check_error(lib.monetdbe_append(self._monetdbe_database, schema.encode(),
+                                                    table.encode(), work_columns, len(existing_columns)))
+        except BaseException:
+            if not in_transaction:
+                self.query("rollback")
+            raise
+        if not in_transaction:
+            self.query("commit")
+
+    def _convert_columns(self, existing_columns: List[Tuple[str, int, Optional[int]]],
+                         data: Mapping[str, Union[np.ndarray, PackedValues]], start: int, stop: int) -> Tuple[Any, List]:
+        """
+        Convert rows start up to stop of the appended data into monetdbe columns. Returns the columns, and the objects
+        that should be kept alive until the columns are appended.
+        """
+        n_columns = len(existing_columns)
         work_columns = ffi.new(f'monetdbe_column * [{n_columns}]')
-        work_objs = []
-        cffi_objects = list()  # keep weak references to cffi objects alive
-        for column_num, (column_name, existing_type) in enumerate(existing_columns):
-            column_values = data[column_name]
+        work_objs: List[Any] = []
+        cffi_objects: List[Any] = [work_objs]  # keep weak references to cffi objects alive
+        for column_num, (column_name, existing_type, scale) in enumerate(existing_columns):
+            column_values: Any = slice_column(data[column_name], start, stop)
             work_column = ffi.new('monetdbe_column *')
+            work_column.count = column_values.shape[0]
+            name = ffi.new('char[]', column_name.encode())
+            cffi_objects.append(name)
+            work_column.name = name
+            work_columns[column_num] = work_column
+            work_objs.append(work_column)
+
+            if isinstance(column_values, PackedValues) and existing_type not in (lib.monetdbe_str, lib.monetdbe_blob):
+                existing_type_string = monet_c_type_map[existing_type].c_string_type
+                raise ValueError(f"Can't convert packed values to type '{existing_type_string}' for column '{column_name}'")
+            elif scale is not None:
+                column_values = numpy_to_decimal_column(column_values, scale, monet_c_type_map[existing_type].numpy_type)
+            elif existing_type == lib.monetdbe_str:
+                if not isinstance(column_values, PackedValues) and column_values.dtype.kind not in 'UO':
+                    column_values = column_values.astype(np.str_)
+                work_column.type = existing_type
+                work_column.data = numpy_to_string_column(column_values, cffi_objects)
+                continue
+            elif existing_type == lib.monetdbe_blob:
+                work_column.type = existing_type
+                work_column.data = numpy_to_blob_column(column_values, cffi_objects)
+                continue
+            elif existing_type == lib.monetdbe_time:
+                if column_values.dtype.kind == 'O':
+                    column_values = objects_to_numpy(column_values, existing_type)
+                if column_values.dtype.kind != 'm':
+                    raise ValueError(f"Can't convert '{column_values.dtype}' to type 'time' for column '{column_name}'")
+                ms = np.ascontiguousarray(column_values.astype('timedelta64[ms]'))
+                cffi_objects.append(ms)
+                t = ffi.new('monetdbe_data_time[]', work_column.count)
+                cffi_objects.append(t)
+                lib.initialize_time_array_from_numpy(self._monetdbe_database, t, work_column.count,
+                                                     ffi.from_buffer("int64_t*", ms))
+                work_column.type = existing_type
+                work_column.data = t
+                continue
+            elif column_values.dtype.kind == 'O':
+                column_values = objects_to_numpy(column_values, existing_type)
+
             type_info = numpy_monetdb_map(column_values.dtype)
 
             # try to convert the values if types don't match
@@ -325,8 +842,6 @@ class Internal:
                         raise ValueError(error)
 
             work_column.type = type_info.c_type
-            work_column.count = column_values.shape[0]
-            work_column.name = ffi.new('char[]', column_name.encode())
             if type_info.numpy_type.kind == 'M':
                 t = ffi.new('monetdbe_data_timestamp[]', work_column.count)
                 cffi_objects.append(t)
@@ -335,30 +850,77 @@ class Internal:
 
                 lib.initialize_timestamp_array_from_numpy(self._monetdbe_database, t, work_column.count, p, unit, existing_type)
                 work_column.data = t
-            elif type_info.numpy_type.kind == 'U':
-                # first massage the numpy array of unicode into a matrix of null terminated rows of bytes.
-                m = ffi.from_buffer("bool*", column_values.mask) if np.ma.isMaskedArray(column_values) else 0  # type: ignore[attr-defined]
-                cffi_objects.append(m)
-                v = np.char.encode(column_values).view('b').reshape((work_column.count, -1))
-                v = np.c_[v, np.zeros(work_column.count, dtype=np.int8)]
-                stride_length = v.shape[1]
-                cffi_objects.append(v)
-                t = ffi.new('char*[]', work_column.count)
-                cffi_objects.append(t)
-                p = ffi.from_buffer("char*", v)
-                cffi_objects.append(p)
-                lib.initialize_string_array_from_numpy(t, work_column.count, p, stride_length, ffi.cast("bool*", m))
-                work_column.data = t
             else:
+                if np.ma.isMaskedArray(column_values):  # type: ignore[attr-defined]
+                    # monetdbe marks missing values with a special null value
+                    if type_info.c_type == lib.monetdbe_bool:
+                        c_string_type, numpy_type = "int8_t", np.dtype(np.int8)
+                    else:
+                        c_string_type, numpy_type = type_info.c_string_type, monet_c_type_map[type_info.c_type].numpy_type
+                    null_value = ffi.cast(f"{c_string_type} *", lib.monetdbe_null(self._monetdbe_database, type_info.c_type))[0]
+                    column_values = column_values.astype(numpy_type).filled(null_value)  # type: ignore[attr-defined]
                 if not column_values.flags.c_contiguous:  # Checks if the array is C-contiguous
                     column_values = np.ascontiguousarray(column_values)  # Converts the array to C-contiguous
                 p = ffi.from_buffer(f"{type_info.c_string_type}*", column_values)
                 cffi_objects.append(p)
                 work_column.data = p
-            work_columns[column_num] = work_column
-            work_objs.append(work_column)
-        check_error(lib.monetdbe_append(self._monetdbe_database, schema.encode(),
-                                        table.encode(), work_columns, n_columns))
+        return work_columns, cffi_objects
+
+    def execute_batch(self, statement: monetdbe_statement, type_info: List[TypeInfo],
+                      columns: Mapping[int, Union[np.ndarray, PackedValues]],
+                      decimal: str = 'float64') -> Union[np.ndarray, Dict[str, np.ndarray]]:
+        """
+        Execute a prepared statement once for every row of the parameter columns. The columns are converted like
+        appended columns, and the executions bind the values straight from the converted buffers in a native loop.
+
+        Args:
+            statement: the prepared statement
+            type_info: the parameters of the statement, as returned by prepare()
+            columns: the values of every parameter, by parameter number
+            decimal: how to convert decimal result columns, see result_fetch_numpy()
+
+        returns:
+            the number of affected rows of every execution, or if the statement returns rows, the rows of all
+            executions concatenated
+        """
+        self._switch()
+        if set(columns) != set(range(len(type_info))):
+            raise exceptions.ProgrammingError(f"The statement uses {len(type_info)} parameters, columns should be "
+                                              f"given for parameter 0 up to {len(type_info) - 1}")
+        data = {str(i): values if isinstance(values, PackedValues) else np.asanyarray(values)
+                for i, values in columns.items()}
+        sizes = {values.shape[0] for values in data.values()}
+        if len(sizes) > 1:
+            raise exceptions.ProgrammingError("The parameter columns don't have the same number of rows")
+        size = sizes.pop() if sizes else 0
+
+        parameters = [(str(i), statement.type[i], info.scale if info.sql_type == 'decimal' else None)
+                      for i, info in enumerate(type_info)]
+        work_columns, keep_alive = self._convert_columns(parameters, data, 0, size)
+        masks = [np.ascontiguousarray(null_mask(data[name]), dtype=np.bool_) for name, _, _ in parameters]
+        p_masks = [ffi.from_buffer("bool*", mask) for mask in masks]
+
+        affected_rows = np.zeros(size, dtype=np.int64)
+        results = ffi.new("monetdbe_result*[]", size)
+        done = ffi.new("size_t *")
+        error = lib.execute_prepared_batch(statement, work_columns, ffi.new("bool*[]", p_masks), len(parameters), size,
+                                           ffi.from_buffer("monetdbe_cnt*", affected_rows), results, done)
+        # take ownership of the results before raising, so they are cleaned up
+        pointers = np.frombuffer(ffi.buffer(results), dtype=np.uintp)[:done[0]]
+        owned = [Result(self, results[int(i)]) for i in np.flatnonzero(pointers)]
+        check_error(error)
+
+        if not owned:
+            return affected_rows
+        batches = [result_fetch_numpy(result, decimal=decimal) for result in owned]
+        concatenated = {}
+        for name in batches[0]:
+            arrays = [batch[name] for batch in batches]
+            if any(np.ma.isMaskedArray(array) for array in arrays):  # type: ignore[attr-defined]
+                concatenated[name] = np.ma.concatenate(arrays)  # type: ignore[attr-defined]
+            else:
+                concatenated[name] = np.concatenate(arrays)
+        return concatenated
 
     def prepare(self, query: str) -> monetdbe_statement:
         self._switch()
@@ -367,12 +929,15 @@ class Internal:
         p_result = ffi.new("monetdbe_result **")
         check_error(lib.monetdbe_prepare(self._monetdbe_database, str(query).encode(), stmt, p_result))
 
-        input_parameter_info = list()
+        input_parameter_info: List[TypeInfo] = list()
 
         for r in range(p_result[0].nrows):
             if (extract(result_fetch(p_result[0], 3), r)) is None:
-                row = TypeInfo(impl_type=extract(result_fetch(p_result[0], 6), r), sql_type=extract(result_fetch(p_result[0], 0), r), scale=extract(result_fetch(p_result[0], 2), r))
-                input_parameter_info.append(row)
+                impl_type = extract(result_fetch(p_result[0], 6), r)
+                sql_type = extract(result_fetch(p_result[0], 0), r)
+                scale = extract(result_fetch(p_result[0], 2), r)
+                binder = parameter_binder(stmt[0].type[len(input_parameter_info)], sql_type, impl_type, scale)
+                input_parameter_info.append(TypeInfo(impl_type=impl_type, sql_type=sql_type, scale=scale, binder=binder))
         self.cleanup_result(p_result[0])
 
         return stmt[0], input_parameter_info
@@ -381,6 +946,44 @@ class Internal:
         self._switch()
         lib.monetdbe_cleanup_statement(self._monetdbe_database, statement)
 
+    def prepare_cached(self, query: str) -> Tuple[monetdbe_statement, List[TypeInfo]]:
+        """
+        Like prepare(), but reuse the statement if the same query was prepared before.
+
+        Statements are kept in a least recently used cache of at most `cached_statements` entries. Queries that can
+        change the schema (DDL, SET, ROLLBACK) clear the cache and are never cached themselves. Give the statement
+        back with release_statement() when done.
+        """
+        cached = self._statement_cache.get(query)
+        if cached:
+            self._statement_cache.move_to_end(query)
+            return cached
+
+        if invalidates_statements.search(query):
+            self.clear_statement_cache()
+            return self.prepare(query)
+
+        prepared = self.prepare(query)
+        if self.cached_statements > 0:
+            self._statement_cache[query] = prepared
+            while len(self._statement_cache) > self.cached_statements:
+                _, (statement, _) = self._statement_cache.popitem(last=False)
+                self.cleanup_statement(statement)
+        return prepared
+
+    def release_statement(self, query: str, statement: monetdbe_statement) -> None:
+        """
+        Give back a statement obtained with prepare_cached(), cleaning it up if it isn't cached.
+        """
+        cached = self._statement_cache.get(query)
+        if not cached or cached[0] != statement:
+            self.cleanup_statement(statement)
+
+    def clear_statement_cache(self) -> None:
+        while self._statement_cache:
+            _, (statement, _) = self._statement_cache.popitem()
+            self.cleanup_statement(statement)
+
     def load_extension(self, name: str):
         if newer_then_dec2023:
             lib.monetdbe_load_extension(self._monetdbe_database, str(name).encode())
@@ -395,7 +998,7 @@ class Internal:
         lib.monetdbe_dump_table(self._monetdbe_database, schema_name.encode(), table_name.encode(),
                                 str(backupfile).encode())
 
-    def get_columns(self, table: str, schema: str = 'sys') -> Iterator[Tuple[str, int]]:
+    def _get_columns(self, table: str, schema: str = 'sys') -> Iterator[monetdbe_column]:
         self._switch()
         count_p = ffi.new('size_t*')
         columns_p = ffi.new('monetdbe_column**')
@@ -403,9 +1006,11 @@ class Internal:
         lib.monetdbe_get_columns(self._monetdbe_database, schema.encode(), table.encode(), count_p, columns_p)
 
         for i in range(count_p[0]):
-            name = ffi.string(columns_p[0][i].name).decode()
-            type_ = columns_p[0][i].type
-            yield name, type_
+            yield columns_p[0] + i
+
+    def get_columns(self, table: str, schema: str = 'sys') -> Iterator[Tuple[str, int]]:
+        for rcol in self._get_columns(table=table, schema=schema):
+            yield ffi.string(rcol.name).decode(), rcol.type
 
     def get_port(self) -> Optional[int]:
         if self.mapi_server_host == "none":
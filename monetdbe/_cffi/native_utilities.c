@@ -16,12 +16,161 @@ Some of the code in this file is derived from Pandas 1.3.5. See PANDAS_LICENSE.t
 
 #include "monetdb/monetdbe.h"
 
-void initialize_string_array_from_numpy(char** restrict output, size_t size, char* restrict numpy_string_input, size_t stride_length, bool* restrict mask) {
-    if (mask) for   (size_t i = 0; i < size; i++) {
-        output[i] = mask[i] ? NULL : numpy_string_input + i*stride_length;
+static inline size_t
+utf8_length(const uint32_t c) {
+    return c < 0x80 ? 1 : c < 0x800 ? 2 : c < 0x10000 ? 3 : 4;
+}
+
+/*
+ * Returns the number of bytes needed to store the strings of a fixed width numpy unicode array as null terminated
+ * UTF-8.
+ */
+size_t utf8_size_of_numpy_string_array(const uint32_t* restrict numpy_string_input, const size_t size, const size_t width) {
+    size_t total = 0;
+    for (size_t i = 0; i < size; i++) {
+        const uint32_t* row = numpy_string_input + i*width;
+        for (size_t j = 0; j < width && row[j]; j++) {
+            total += utf8_length(row[j]);
+        }
+        total += 1;
+    }
+    return total;
+}
+
+/*
+ * Encodes the strings of a fixed width numpy unicode array one after the other into buffer as null terminated UTF-8,
+ * and points output to them. Masked rows become null. The buffer should be utf8_size_of_numpy_string_array() bytes.
+ */
+void initialize_string_array_from_numpy(char** restrict output, const size_t size, const size_t width, const uint32_t* restrict numpy_string_input, char* restrict buffer, bool* restrict mask) {
+    unsigned char* b = (unsigned char*) buffer;
+    for (size_t i = 0; i < size; i++) {
+        if (mask && mask[i]) {
+            output[i] = NULL;
+            continue;
+        }
+        output[i] = (char*) b;
+        const uint32_t* row = numpy_string_input + i*width;
+        for (size_t j = 0; j < width && row[j]; j++) {
+            const uint32_t c = row[j];
+            switch (utf8_length(c)) {
+            case 1:
+                *b++ = (unsigned char) c;
+                break;
+            case 2:
+                *b++ = (unsigned char) (0xC0 | (c >> 6));
+                *b++ = (unsigned char) (0x80 | (c & 0x3F));
+                break;
+            case 3:
+                *b++ = (unsigned char) (0xE0 | (c >> 12));
+                *b++ = (unsigned char) (0x80 | ((c >> 6) & 0x3F));
+                *b++ = (unsigned char) (0x80 | (c & 0x3F));
+                break;
+            default:
+                *b++ = (unsigned char) (0xF0 | (c >> 18));
+                *b++ = (unsigned char) (0x80 | ((c >> 12) & 0x3F));
+                *b++ = (unsigned char) (0x80 | ((c >> 6) & 0x3F));
+                *b++ = (unsigned char) (0x80 | (c & 0x3F));
+            }
+        }
+        *b++ = '\0';
+    }
+}
+
+/*
+ * Copies packed strings, string i is data[offsets[i]:offsets[i + 1]] like in an Arrow string array, into buffer as
+ * null terminated strings and points output to them. Masked rows become null. The buffer should be
+ * offsets[size] - offsets[0] + size bytes.
+ */
+void initialize_string_array_from_offsets(char** restrict output, const size_t size, const char* restrict data, const int64_t* restrict offsets, char* restrict buffer, bool* restrict mask) {
+    for (size_t i = 0; i < size; i++) {
+        if (mask && mask[i]) {
+            output[i] = NULL;
+            continue;
+        }
+        const size_t length = (size_t) (offsets[i + 1] - offsets[i]);
+        memcpy(buffer, data + offsets[i], length);
+        buffer[length] = '\0';
+        output[i] = buffer;
+        buffer += length + 1;
+    }
+}
+
+/*
+ * Fills the null mask of a monetdbe string column and returns the width in code points of the longest string,
+ * which is the width of the numpy unicode array that can hold the column.
+ */
+size_t initialize_string_mask_from_monetdbe(bool* restrict mask, const size_t size, char** restrict monetdbe_string_input) {
+    size_t width = 0;
+    for (size_t i = 0; i < size; i++) {
+        const unsigned char* s = (const unsigned char*) monetdbe_string_input[i];
+        mask[i] = s == NULL;
+        if (!s)
+            continue;
+        size_t length = 0;
+        for (; *s; s++) {
+            /* count everything but utf-8 continuation bytes */
+            length += (*s & 0xC0) != 0x80;
+        }
+        if (length > width)
+            width = length;
+    }
+    return width;
+}
+
+/*
+ * Fills the null mask of a monetdbe string column and the Arrow style offsets of its UTF-8 data, string i will be
+ * data[offsets[i]:offsets[i + 1]]. Null strings are empty. Offsets should hold size + 1 values, the last one is the
+ * total size of the data.
+ */
+void initialize_string_offsets_from_monetdbe(int64_t* restrict offsets, bool* restrict mask, const size_t size, char** restrict monetdbe_string_input) {
+    offsets[0] = 0;
+    for (size_t i = 0; i < size; i++) {
+        const char* s = monetdbe_string_input[i];
+        mask[i] = s == NULL;
+        offsets[i + 1] = offsets[i] + (s ? (int64_t) strlen(s) : 0);
     }
-    else for        (size_t i = 0; i < size; i++) {
-        output[i] = numpy_string_input + i*stride_length;
+}
+
+/*
+ * Copies the strings of a monetdbe string column into data, without null terminators, at the offsets filled by
+ * initialize_string_offsets_from_monetdbe().
+ */
+void initialize_string_data_from_monetdbe(char* restrict output, const size_t size, const int64_t* restrict offsets, char** restrict monetdbe_string_input) {
+    for (size_t i = 0; i < size; i++) {
+        if (monetdbe_string_input[i])
+            memcpy(output + offsets[i], monetdbe_string_input[i], (size_t) (offsets[i + 1] - offsets[i]));
+    }
+}
+
+/*
+ * Decodes a monetdbe string column into a zero initialized numpy unicode array with the given width. Rows that are
+ * null are left empty.
+ */
+void initialize_numpy_string_array_from_monetdbe(uint32_t* restrict output, const size_t size, const size_t width, char** restrict monetdbe_string_input) {
+    for (size_t i = 0; i < size; i++) {
+        const unsigned char* s = (const unsigned char*) monetdbe_string_input[i];
+        if (!s)
+            continue;
+        uint32_t* row = output + i*width;
+        size_t j = 0;
+        while (*s && j < width) {
+            uint32_t c = *s++;
+            int continuation = 0;
+            if (c >= 0xF0) {
+                c &= 0x07;
+                continuation = 3;
+            } else if (c >= 0xE0) {
+                c &= 0x0F;
+                continuation = 2;
+            } else if (c >= 0xC0) {
+                c &= 0x1F;
+                continuation = 1;
+            }
+            for (; continuation && (*s & 0xC0) == 0x80; continuation--) {
+                c = (c << 6) | (*s++ & 0x3F);
+            }
+            row[j++] = c;
+        }
     }
 }
 
@@ -426,3 +575,265 @@ void initialize_timestamp_array_from_numpy(
         }
     }
 }
+
+/*
+ * Calculates the days offset from the 1970 epoch.
+ */
+static int64_t
+get_datetimestruct_days(const npy_datetimestruct *dts) // from numpy:datetime.c
+{
+    int i, month;
+    int64_t year, days = 0;
+    int *month_lengths;
+
+    year = dts->year - 1970;
+    days = year * 365;
+
+    /* Adjust for leap years */
+    if (days >= 0) {
+        /*
+         * 1968 is the closest leap year before 1970.
+         * Exclude the current year, so add 1.
+         */
+        year += 1;
+        /* Add one day for each 4 years */
+        days += year / 4;
+        /* 1900 is the closest previous year divisible by 100 */
+        year += 68;
+        /* Subtract one day for each 100 years */
+        days -= year / 100;
+        /* 1600 is the closest previous year divisible by 400 */
+        year += 300;
+        /* Add one day for each 400 years */
+        days += year / 400;
+    }
+    else {
+        /*
+         * 1972 is the closest later year after 1970.
+         * Include the current year, so subtract 2.
+         */
+        year -= 2;
+        /* Subtract one day for each 4 years */
+        days += year / 4;
+        /* 2000 is the closest later year divisible by 100 */
+        year -= 28;
+        /* Add one day for each 100 years */
+        days -= year / 100;
+        /* 2000 is also the closest later year divisible by 400 */
+        /* Subtract one day for each 400 years */
+        days += year / 400;
+    }
+
+    month_lengths = _days_per_month_table[is_leapyear(dts->year)];
+    month = dts->month - 1;
+
+    /* Add the months */
+    for (i = 0; i < month; ++i) {
+        days += month_lengths[i];
+    }
+
+    /* Add the days */
+    days += dts->day - 1;
+
+    return days;
+}
+
+#define MS_PER_DAY (24LL * 60 * 60 * 1000)
+
+static inline int
+date_is_null(const monetdbe_data_date* d, const monetdbe_data_date* null_value) {
+    return d->year == null_value->year && d->month == null_value->month && d->day == null_value->day;
+}
+
+static inline int
+time_is_null(const monetdbe_data_time* t, const monetdbe_data_time* null_value) {
+    return t->hours == null_value->hours && t->minutes == null_value->minutes &&
+           t->seconds == null_value->seconds && t->ms == null_value->ms;
+}
+
+static inline int64_t
+date_to_days(const monetdbe_data_date* d) {
+    npy_datetimestruct dts = {0};
+    dts.year = d->year;
+    dts.month = d->month;
+    dts.day = d->day;
+    return get_datetimestruct_days(&dts);
+}
+
+static inline int64_t
+time_to_ms(const monetdbe_data_time* t) {
+    return ((t->hours * 60LL + t->minutes) * 60LL + t->seconds) * 1000LL + t->ms;
+}
+
+/*
+ * Fills a numpy datetime64[D] array from a monetdbe date column, nulls become NaT.
+ */
+void initialize_numpy_date_array_from_monetdbe(
+    int64_t* restrict output, const size_t size,
+    monetdbe_data_date* restrict monetdbe_date_input, const monetdbe_data_date null_value) {
+
+    for (size_t i = 0; i < size; i++) {
+        const monetdbe_data_date* d = &monetdbe_date_input[i];
+        output[i] = date_is_null(d, &null_value) ? NPY_DATETIME_NAT : date_to_days(d);
+    }
+}
+
+/*
+ * Fills a numpy timedelta64[ms] array with the time since midnight from a monetdbe time column, nulls become NaT.
+ */
+void initialize_numpy_time_array_from_monetdbe(
+    int64_t* restrict output, const size_t size,
+    monetdbe_data_time* restrict monetdbe_time_input, const monetdbe_data_time null_value) {
+
+    for (size_t i = 0; i < size; i++) {
+        const monetdbe_data_time* t = &monetdbe_time_input[i];
+        output[i] = time_is_null(t, &null_value) ? NPY_DATETIME_NAT : time_to_ms(t);
+    }
+}
+
+/*
+ * Fills a numpy datetime64[ms] array from a monetdbe timestamp column, nulls become NaT.
+ */
+void initialize_numpy_timestamp_array_from_monetdbe(
+    int64_t* restrict output, const size_t size,
+    monetdbe_data_timestamp* restrict monetdbe_timestamp_input, const monetdbe_data_timestamp null_value) {
+
+    for (size_t i = 0; i < size; i++) {
+        const monetdbe_data_timestamp* ts = &monetdbe_timestamp_input[i];
+        if (date_is_null(&ts->date, &null_value.date) && time_is_null(&ts->time, &null_value.time))
+            output[i] = NPY_DATETIME_NAT;
+        else
+            output[i] = date_to_days(&ts->date) * MS_PER_DAY + time_to_ms(&ts->time);
+    }
+}
+
+/*
+ * Fills a monetdbe time column from a numpy timedelta64[ms] array with the time since midnight, NaT becomes null.
+ */
+void initialize_time_array_from_numpy(
+    monetdbe_database dbhdl,
+    monetdbe_data_time* restrict output, const size_t size,
+    int64_t* restrict numpy_timedelta_input) {
+
+    for (size_t i = 0; i < size; i++) {
+        int64_t ms = numpy_timedelta_input[i];
+        if (ms == NPY_DATETIME_NAT) {
+            output[i] = *(monetdbe_data_time*) monetdbe_null(dbhdl, monetdbe_time);
+            continue;
+        }
+        /* a time of day wraps around midnight */
+        ms = (ms % MS_PER_DAY + MS_PER_DAY) % MS_PER_DAY;
+        output[i].ms      = (unsigned int) (ms % 1000);
+        output[i].seconds = (unsigned char) (ms / 1000 % 60);
+        output[i].minutes = (unsigned char) (ms / (60 * 1000) % 60);
+        output[i].hours   = (unsigned char) (ms / (60 * 60 * 1000));
+    }
+}
+
+/*
+ * Fills a monetdbe blob column with views into one packed buffer. Value i is stored at offsets[i] up to offsets[i+1],
+ * masked values become null.
+ */
+void initialize_blob_array_from_numpy(
+    monetdbe_data_blob* restrict output, const size_t size,
+    char* restrict buffer, int64_t* restrict offsets, bool* restrict mask) {
+
+    for (size_t i = 0; i < size; i++) {
+        if (mask && mask[i]) {
+            output[i].size = 0;
+            output[i].data = NULL;
+        } else {
+            output[i].size = (size_t) (offsets[i + 1] - offsets[i]);
+            output[i].data = buffer + offsets[i];
+        }
+    }
+}
+
+/*
+ * Fills the null mask of a monetdbe blob column and the Arrow style offsets of its data, blob i will be
+ * data[offsets[i]:offsets[i + 1]]. Null blobs are empty. Offsets should hold size + 1 values.
+ */
+void initialize_blob_offsets_from_monetdbe(int64_t* restrict offsets, bool* restrict mask, const size_t size, monetdbe_data_blob* restrict monetdbe_blob_input) {
+    offsets[0] = 0;
+    for (size_t i = 0; i < size; i++) {
+        mask[i] = monetdbe_blob_input[i].data == NULL;
+        offsets[i + 1] = offsets[i] + (mask[i] ? 0 : (int64_t) monetdbe_blob_input[i].size);
+    }
+}
+
+/*
+ * Copies the values of a monetdbe blob column into data at the offsets filled by
+ * initialize_blob_offsets_from_monetdbe().
+ */
+void initialize_blob_data_from_monetdbe(char* restrict output, const size_t size, const int64_t* restrict offsets, monetdbe_data_blob* restrict monetdbe_blob_input) {
+    for (size_t i = 0; i < size; i++) {
+        if (monetdbe_blob_input[i].data)
+            memcpy(output + offsets[i], monetdbe_blob_input[i].data, (size_t) (offsets[i + 1] - offsets[i]));
+    }
+}
+
+/*
+ * The address of value i of a monetdbe column, in the form monetdbe_bind() expects it: strings are bound by their
+ * pointer, other types by a pointer to the value. Returns NULL for types that can't be bound.
+ */
+static void*
+column_value(const monetdbe_column* column, const size_t i) {
+    switch (column->type) {
+        case monetdbe_bool:
+        case monetdbe_int8_t:
+            return (int8_t*) column->data + i;
+        case monetdbe_int16_t:
+            return (int16_t*) column->data + i;
+        case monetdbe_int32_t:
+            return (int32_t*) column->data + i;
+        case monetdbe_int64_t:
+            return (int64_t*) column->data + i;
+        case monetdbe_size_t:
+            return (size_t*) column->data + i;
+        case monetdbe_float:
+            return (float*) column->data + i;
+        case monetdbe_double:
+            return (double*) column->data + i;
+        case monetdbe_str:
+            return ((char**) column->data)[i];
+        case monetdbe_blob:
+            return (monetdbe_data_blob*) column->data + i;
+        case monetdbe_date:
+            return (monetdbe_data_date*) column->data + i;
+        case monetdbe_time:
+            return (monetdbe_data_time*) column->data + i;
+        case monetdbe_timestamp:
+            return (monetdbe_data_timestamp*) column->data + i;
+        default:
+            return NULL;
+    }
+}
+
+/*
+ * Executes a prepared statement once for every row of the parameter columns, parameter j of execution i is bound to
+ * value i of input[j], or to null where masks[j][i] is set. The affected rows and the result of execution i are stored
+ * in affected_rows[i] and results[i]. Stops at the first error and returns it, *done is the number of executions that
+ * completed.
+ */
+char* execute_prepared_batch(monetdbe_statement* stmt, monetdbe_column** input, bool** masks, const size_t nparams,
+                             const size_t nrows, monetdbe_cnt* affected_rows, monetdbe_result** results, size_t* done) {
+    static char unsupported[] = "execute_prepared_batch: unsupported parameter type";
+    char* error = NULL;
+
+    *done = 0;
+    for (size_t j = 0; j < nparams; j++) {
+        if (input[j]->count < nrows || (input[j]->type != monetdbe_str && nrows && !column_value(input[j], 0)))
+            return unsupported;
+    }
+    for (size_t i = 0; i < nrows; i++) {
+        for (size_t j = 0; j < nparams; j++) {
+            void* value = masks[j][i] ? NULL : column_value(input[j], i);
+            if ((error = monetdbe_bind(stmt, value, j)))
+                return error;
+        }
+        if ((error = monetdbe_execute(stmt, &results[i], &affected_rows[i])))
+            return error;
+        *done = i + 1;
+    }
+    return NULL;
+}
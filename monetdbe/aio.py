@@ -0,0 +1,212 @@
+"""
+This module contains the asyncio interface.
+
+Every AsyncConnection runs its connection on a dedicated thread, so executing queries, fetching results and appending
+data don't block the event loop. The operations of a connection are executed one at a time, in the order they are
+awaited.
+
+Cancelling an operation that is waiting for its turn removes it from the queue. MonetDBe has no way to interrupt a
+running query, so cancelling an operation that already started stops the wait, but the operation completes in the
+background and the operations after it wait for it. Use the querytimeout argument of connect() to bound the run time
+of queries.
+"""
+import asyncio
+from concurrent.futures import ThreadPoolExecutor
+from functools import partial
+from typing import Optional, Any, Callable, List, Mapping, Union, Iterator, AsyncIterator, Iterable, TYPE_CHECKING
+
+import numpy as np
+
+from monetdbe import dbapi2
+from monetdbe.connection import Connection
+from monetdbe.formatting import parameters_type
+
+if TYPE_CHECKING:
+    import pandas as pd
+    import pyarrow as pa
+    from monetdbe.cursors import Cursor
+    from monetdbe.row import Row
+
+
+def _executed(execute: Callable, *args) -> 'Cursor':
+    """
+    Run an execute method and save the column info of the result, which needs the engine, on the connection thread.
+    The description is built from it when it is asked for.
+    """
+    cursor = execute(*args)
+    cursor._save_columns()
+    return cursor
+
+
+class AsyncCursor:
+    # the number of rows fetched at once when iterating over the cursor
+    batch_size = 1024
+
+    def __init__(self, connection: 'AsyncConnection', cursor: 'Cursor'):
+        self.connection = connection
+        self._cursor = cursor
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, exc_type, exc_value, traceback):
+        await self.close()
+
+    def __aiter__(self) -> AsyncIterator[Union['Row', Any]]:
+        return self._iterate()
+
+    async def _iterate(self) -> AsyncIterator[Union['Row', Any]]:
+        # rows are only fetched when the consumer asks for them, so a slow consumer holds up the fetching
+        while True:
+            rows = await self.fetchmany(self.batch_size)
+            if not rows:
+                return
+            for row in rows:
+                yield row
+
+    async def _iterate_batches(self, batches: Iterator) -> AsyncIterator:
+        while True:
+            batch = await self.connection._run(next, batches, None)
+            if batch is None:
+                return
+            yield batch
+
+    @property
+    def description(self):
+        return self._cursor.description
+
+    @property
+    def rowcount(self) -> int:
+        return self._cursor.rowcount
+
+    @property
+    def lastrowid(self) -> int:
+        return self._cursor.lastrowid
+
+    @property
+    def arraysize(self) -> int:
+        return self._cursor.arraysize
+
+    @arraysize.setter
+    def arraysize(self, value: int) -> None:
+        self._cursor.arraysize = value
+
+    async def execute(self, operation: str, parameters: parameters_type = None) -> 'AsyncCursor':
+        await self.connection._run(_executed, self._cursor.execute, operation, parameters)
+        return self
+
+    async def executemany(self, operation: str, seq_of_parameters: Union[Iterator, Iterable[Iterable]]) -> 'AsyncCursor':
+        await self.connection._run(_executed, self._cursor.executemany, operation, seq_of_parameters)
+        return self
+
+    async def fetchone(self) -> Optional[Union['Row', Any]]:
+        return await self.connection._run(self._cursor.fetchone)
+
+    async def fetchmany(self, size: Optional[int] = None) -> List[Union['Row', Any]]:
+        return await self.connection._run(self._cursor.fetchmany, size)
+
+    async def fetchall(self) -> List[Union['Row', Any]]:
+        return await self.connection._run(self._cursor.fetchall)
+
+    async def fetchnumpy(self, decimal: str = 'float64', threads: Optional[int] = None) -> Mapping[str, np.ndarray]:
+        return await self.connection._run(self._cursor.fetchnumpy, decimal, threads)
+
+    async def fetchdf(self, decimal: str = 'float64', threads: Optional[int] = None) -> 'pd.DataFrame':
+        return await self.connection._run(self._cursor.fetchdf, decimal, threads)
+
+    async def fetch_arrow(self) -> 'pa.Table':
+        return await self.connection._run(self._cursor.fetch_arrow)
+
+    async def fetchnumpy_batches(self, rows: int = 100_000, decimal: str = 'float64',
+                                 threads: Optional[int] = None) -> AsyncIterator[Mapping[str, np.ndarray]]:
+        """
+        Like Cursor.fetchnumpy_batches(), a batch is only converted when the consumer asks for it.
+        """
+        batches = await self.connection._run(self._cursor.fetchnumpy_batches, rows, decimal, threads)
+        async for batch in self._iterate_batches(batches):
+            yield batch
+
+    async def fetchdf_batches(self, rows: int = 100_000, decimal: str = 'float64',
+                              threads: Optional[int] = None) -> AsyncIterator['pd.DataFrame']:
+        """
+        Like Cursor.fetchdf_batches(), a batch is only converted when the consumer asks for it.
+        """
+        batches = await self.connection._run(self._cursor.fetchdf_batches, rows, decimal, threads)
+        async for batch in self._iterate_batches(batches):
+            yield batch
+
+    async def close(self) -> None:
+        await self.connection._run(self._cursor.close)
+
+
+class AsyncConnection:
+    def __init__(self, connection: Connection, executor: ThreadPoolExecutor):
+        """
+        Use connect() to create an AsyncConnection.
+        """
+        self._connection = connection
+        self._executor = executor
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, exc_type, exc_value, traceback):
+        await self.close()
+
+    async def _run(self, function: Callable, *args, **kwargs) -> Any:
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(self._executor, partial(function, *args, **kwargs))
+
+    async def cursor(self) -> AsyncCursor:
+        return AsyncCursor(self, await self._run(self._connection.cursor))
+
+    async def execute(self, operation: str, parameters: parameters_type = None) -> AsyncCursor:
+        return AsyncCursor(self, await self._run(_executed, self._connection.execute, operation, parameters))
+
+    async def executemany(self, operation: str, seq_of_parameters: Union[Iterator, Iterable[Iterable]]) -> AsyncCursor:
+        return AsyncCursor(self, await self._run(_executed, self._connection.executemany, operation,
+                                                 seq_of_parameters))
+
+    async def execute_batch(self, operation: str, columns: Mapping[int, np.ndarray],
+                            decimal: str = 'float64') -> Union[np.ndarray, Mapping[str, np.ndarray]]:
+        return await self._run(self._connection.execute_batch, operation, columns, decimal)
+
+    async def executescript(self, sql_script: str) -> None:
+        await self._run(self._connection.executescript, sql_script)
+
+    async def commit(self) -> None:
+        await self._run(self._connection.commit)
+
+    async def rollback(self) -> None:
+        await self._run(self._connection.rollback)
+
+    async def append(self, table: str, data: Mapping[str, np.ndarray], schema: str = 'sys',
+                     chunk_size: Optional[int] = None) -> None:
+        await self._run(self._connection.append, table, data, schema, chunk_size)
+
+    async def append_arrow(self, table: str, data: Union['pa.Table', 'pa.RecordBatch'], schema: str = 'sys',
+                           chunk_size: Optional[int] = None) -> None:
+        await self._run(self._connection.append_arrow, table, data, schema, chunk_size)
+
+    async def close(self) -> None:
+        """
+        Close the connection and stop its thread.
+        """
+        try:
+            await self._run(self._connection.close)
+        finally:
+            self._executor.shutdown(wait=False)
+
+
+async def connect(*args, **kwargs) -> AsyncConnection:
+    """
+    Open a connection on a dedicated thread. Accepts the same arguments as monetdbe.connect().
+    """
+    executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix='monetdbe')
+    loop = asyncio.get_running_loop()
+    try:
+        connection = await loop.run_in_executor(executor, partial(dbapi2.connect, *args, **kwargs))
+    except BaseException:
+        executor.shutdown(wait=False)
+        raise
+    return AsyncConnection(connection, executor)
@@ -2,17 +2,22 @@
 This module contains the monetdbe connection class.
 """
 from collections import namedtuple
+from functools import wraps
 from pathlib import Path
-from typing import Optional, Type, Iterable, Union, TYPE_CHECKING, Callable, Any, Iterator, Tuple, Mapping
-from itertools import repeat
+from threading import RLock, get_ident
+from typing import Optional, Type, Iterable, Union, TYPE_CHECKING, Callable, Any, Iterator, Tuple, Mapping, TypeVar, \
+    cast
+from weakref import WeakSet
 import numpy as np
 
 from monetdbe import exceptions
 from monetdbe.formatting import parameters_type
 
 if TYPE_CHECKING:
+    import pyarrow as pa
     from monetdbe.row import Row
     from monetdbe.cursors import Cursor  # type: ignore[attr-defined]
+    from monetdbe._cffi.internal import Result
 
 Description = namedtuple('Description', (
     'name',
@@ -24,6 +29,39 @@ Description = namedtuple('Description', (
     'null_ok'
 ))
 
+F = TypeVar('F', bound=Callable[..., Any])
+
+
+def serialized(method: F) -> F:
+    """
+    Hold the lock of the connection while a method of the connection, or of one of its cursors, runs. Connections
+    shared between threads are used by one thread at a time this way.
+    """
+
+    @wraps(method)
+    def wrapper(self, *args, **kwargs):
+        connection = self if isinstance(self, Connection) else self.connection
+        if not connection:
+            # the cursor is closed, let the method raise
+            return method(self, *args, **kwargs)
+        with connection._lock:
+            return method(self, *args, **kwargs)
+
+    return cast(F, wrapper)
+
+
+def serialized_iterator(connection: 'Connection', iterator: Iterator) -> Iterator:
+    """
+    Hold the lock of the connection while the next item of an iterator is produced.
+    """
+    while True:
+        with connection._lock:
+            try:
+                item = next(iterator)
+            except StopIteration:
+                return
+        yield item
+
 
 class Connection:
     def __init__(self,
@@ -42,9 +80,15 @@ class Connection:
                  password: Optional[str] = None,
                  host: Optional[str] = None,
                  port: Optional[int] = None,
-                 usock: Optional[Path] = None
+                 usock: Optional[Path] = None,
+                 cached_statements: int = 128,
                  ):
         """
+        Calls into the MonetDB engine, like executing queries, fetching results and appending data, are made without
+        holding the Python GIL, so other Python threads keep running while a query executes. Separate connections can
+        execute queries from different threads at the same time. A connection created with check_same_thread=False
+        can be shared by threads, which then take turns: every call into the engine holds the lock of the connection.
+
         Args:
             database: The path to you database. Leave empty or use the `:memory:` string to start an in-memory database.
             uri: if true, database is interpreted as a URI. This allows you to specify options.
@@ -53,8 +97,9 @@ class Connection:
                            PARSE_DECLTYPES and PARSE_COLNAMES to turn type detection on.
             check_same_thread: By default, check_same_thread is True and only the creating thread may use the
                                connection. If set False, the returned connection may be shared across multiple threads.
-                               When using multiple threads with the same connection writing operations should be
-                               serialized by the user to avoid data corruption.
+                               Use a cursor per thread, every cursor owns its own result. The transaction state is
+                               shared by all threads, so threads that write should use autocommit or a connection of
+                               their own.
             autocommit: Enable autocommit mode
             nr_threads: to control the level of parallelism, 0 = all cores (default)
             memorylimit: to control the memory footprint allowed in :memory: mode in MB, 0 = no limit (default)
@@ -63,21 +108,19 @@ class Connection:
             username: used to connect to a remote server (not used yet)
             password: credentials to reach the remote server (not used yet)
             port: TCP/IP port to listen for connections (not used yet)
+            cached_statements: The number of prepared statements kept for reuse by this connection, 0 disables the
+                               cache. The cache is cleared by statements that can change the schema.
 
         """
         # import these here so we can import this file without having access to _cffi (yet)
         from monetdbe._cffi import check_if_we_can_import_lowlevel
         from monetdbe._cffi.internal import Internal
-        from monetdbe._cffi.types_ import monetdbe_result
 
         check_if_we_can_import_lowlevel()
 
         if uri or username or password or logging:
             raise NotImplemented
 
-        if not check_same_thread:
-            raise NotImplemented
-
         if detect_types != 0:
             raise NotImplemented
 
@@ -97,7 +140,10 @@ class Connection:
         elif isinstance(usock, str):
             usock = Path(usock).resolve()
 
-        self.result: Optional[monetdbe_result] = None
+        self.check_same_thread = check_same_thread
+        self._thread_ident = get_ident()
+        self._lock = RLock()
+        self._cursors: 'WeakSet[Cursor]' = WeakSet()
         self.row_factory: Optional[Type['Row']] = None
         self.text_factory: Optional[Callable[[str], Any]] = None
         self.total_changes = 0
@@ -113,7 +159,8 @@ class Connection:
             sessiontimeout=timeout,
             mapi_server_host=host,
             mapi_server_port=port,
-            mapi_server_usock=usock
+            mapi_server_usock=usock,
+            cached_statements=cached_statements,
         )
 
         self.set_autocommit(autocommit)
@@ -128,32 +175,22 @@ class Connection:
         raise exceptions.ProgrammingError
 
     def __del__(self):
-        self.close()
+        # the garbage collector may run in any thread
+        self._close()
 
     def _check(self):
         if not hasattr(self, '_internal') or not self._internal:
             raise exceptions.ProgrammingError("The connection has been closed")
+        self._check_thread()
 
-    def get_description(self):
-        # we import this late, otherwise the whole monetdbe project is unimportable
-        # if we don't have access to monetdbe shared library
-        from monetdbe._cffi.convert import make_string, monet_c_type_map
-        from monetdbe._cffi.internal import result_fetch
-
-        if not self.result:
-            return
-
-        columns = list(map(lambda x: result_fetch(self.result, x), range(self.result.ncols)))
-        name = (make_string(rcol.name) for rcol in columns)
-        type_code = (monet_c_type_map[rcol.type].sql_type for rcol in columns)
-        display_size = repeat(None)
-        internal_size = repeat(None)
-        precision = repeat(None)
-        scale = repeat(None)
-        null_ok = repeat(None)
-        descriptions = list(zip(name, type_code, display_size, internal_size, precision, scale, null_ok))
-        return [Description(*i) for i in descriptions]
+    def _check_thread(self):
+        if self.check_same_thread and self._thread_ident != get_ident():
+            raise exceptions.ProgrammingError(
+                "Connection objects created in a thread can only be used in that same thread. The object was created "
+                f"in thread id {self._thread_ident} and this is thread id {get_ident()}. Use check_same_thread=False "
+                "to share a connection between threads.")
 
+    @serialized
     def execute(
             self, query: str,
             args: parameters_type = None,
@@ -179,6 +216,7 @@ class Connection:
         self.consistent = True
         return cur
 
+    @serialized
     def executemany(
             self,
             query: str,
@@ -190,7 +228,7 @@ class Connection:
         sequence seq_of_parameters.
 
         This is a nonstandard and SQLite compatible shortcut that creates a cursor object by calling the cursor()
-        method, calls the cursor’s execute() method with the parameters given, and returns the cursor.
+        method, calls the cursor’s executemany() method with the parameters given, and returns the cursor.
 
         Args:
             query: The SQL query to execute
@@ -200,11 +238,9 @@ class Connection:
         Returns:
             A new cursor instance of the supplied cursor class
         """
-        cur = self.cursor(factory=cursor)
-        for args in args_seq:
-            cur.execute(query, args)
-        return cur
+        return self.cursor(factory=cursor).executemany(query, args_seq)
 
+    @serialized
     def commit(self, *args, **kwargs) -> 'Cursor':
         self._check()
         return self.execute("COMMIT")
@@ -212,12 +248,18 @@ class Connection:
     def close(self, *args, **kwargs) -> None:
         if not hasattr(self, '_internal'):
             return
-        if self.result:
-            self.cleanup_result()
-
         if self._internal:
-            self._internal.close()
-        self._internal = None
+            self._check_thread()
+        self._close()
+
+    def _close(self) -> None:
+        if not hasattr(self, '_internal') or not self._internal:
+            return
+        with self._lock:
+            self.cleanup_result()
+            if self._internal:
+                self._internal.close()
+            self._internal = None
 
     def cursor(self, factory: Optional[Type['Cursor']] = None) -> 'Cursor':
         """
@@ -242,6 +284,7 @@ class Connection:
 
         return cursor
 
+    @serialized
     def executescript(self, sql_script: str):
         self._check()
         for query in sql_script.split(';'):
@@ -256,6 +299,7 @@ class Connection:
     def enable_load_extension(self, __enable: bool = True):
         self._load_extension = __enable
 
+    @serialized
     def load_extension(self, __name: str):
         self._check()
         if self._load_extension and self._internal:
@@ -289,6 +333,7 @@ class Connection:
         self._check()
         raise NotImplemented
 
+    @serialized
     def rollback(self, *args, **kwargs):
         """
         Rolls back the current transaction.
@@ -298,10 +343,12 @@ class Connection:
         self.consistent = False
 
     @property
+    @serialized
     def in_transaction(self):
         self._check()
         return self._internal.in_transaction()
 
+    @serialized
     def set_autocommit(self, value: bool) -> None:
         """
         Set the connection to auto-commit mode.
@@ -318,12 +365,17 @@ class Connection:
     def write_csv(self, table, *args, **kwargs):
         return self.cursor().write_csv(table, *args, **kwargs)
 
+    @serialized
     def cleanup_result(self):
-        if self.result and self._internal:
-            self._internal.cleanup_result(self.result)
-            self.result = None
+        """
+        Release the results of all cursors of this connection. The result data is freed as soon as no numpy array
+        returned by fetchnumpy() uses it anymore.
+        """
+        for cursor in list(self._cursors):
+            cursor.cleanup_result()
 
-    def query(self, query: str, make_result: bool = False) -> Tuple[Optional[Any], int]:
+    @serialized
+    def query(self, query: str, make_result: bool = False) -> Tuple[Optional['Result'], int]:
         """
         Execute a query directly on the connection.
 
@@ -332,18 +384,113 @@ class Connection:
         self._check()
         return self._internal.query(query, make_result)  # type: ignore[union-attr]
 
+    @serialized
     def prepare(self, operation: str):
         self._check()
         return self._internal.prepare(operation)  # type: ignore[union-attr]
 
+    @serialized
+    def prepare_cached(self, operation: str):
+        self._check()
+        return self._internal.prepare_cached(operation)  # type: ignore[union-attr]
+
+    @serialized
+    def release_statement(self, operation: str, statement) -> None:
+        self._check()
+        self._internal.release_statement(operation, statement)  # type: ignore[union-attr]
+
+    @serialized
+    def execute_statement(self, statement, make_result: bool = False) -> Tuple[Optional['Result'], int]:
+        self._check()
+        return self._internal.execute(statement, make_result)  # type: ignore[union-attr]
+
+    @serialized
     def cleanup_statement(self, statement: str) -> None:
         self._check()
         self._internal.cleanup_statement(statement)  # type: ignore[union-attr]
 
-    def append(self, table: str, data: Mapping[str, np.ndarray], schema: str = 'sys') -> None:
+    @serialized
+    def append(self, table: str, data: Mapping[str, np.ndarray], schema: str = 'sys',
+               chunk_size: Optional[int] = None) -> None:
+        """
+        Append a dictionary of numpy arrays to an existing table.
+
+        Args:
+            table: The name of the table to append to
+            data: The arrays, the keys should match the columns of the table
+            schema: The schema of the table
+            chunk_size: Convert and append this many rows at a time, which bounds the memory needed for converted
+                        columns when appending very large arrays. The next chunk is converted while the current one
+                        is appended, all chunks are appended in one transaction. By default all rows are appended at
+                        once.
+        """
+        self._check()
+        self._internal.append(table, data, schema, chunk_size)  # type: ignore[union-attr]
+
+    @serialized
+    def append_arrow(self, table: str, data: Union['pa.Table', 'pa.RecordBatch'], schema: str = 'sys',
+                     chunk_size: Optional[int] = None) -> None:
+        """
+        Append an Apache Arrow table or record batch to an existing table.
+
+        The Arrow buffers are handed to monetdbe directly where the types allow it: numeric columns without nulls are
+        not copied, validity bitmaps become null values and string and binary columns are appended from their
+        offsets and data buffers. Requires pyarrow.
+
+        Args:
+            table: The name of the table to append to
+            data: The Arrow data, the column names should match the columns of the table
+            schema: The schema of the table
+            chunk_size: Convert and append this many rows at a time, see .append()
+        """
+        from monetdbe._cffi.arrow import arrow_to_numpy_dict
+
         self._check()
-        self._internal.append(table, data, schema)  # type: ignore[union-attr]
+        self._internal.append(table, arrow_to_numpy_dict(data), schema, chunk_size)  # type: ignore[union-attr]
+
+    @serialized
+    def execute_batch(self, operation: str, columns: Mapping[int, np.ndarray],
+                      decimal: str = 'float64') -> Union[np.ndarray, Mapping[str, np.ndarray]]:
+        """
+        Execute a query once for every row of a set of parameter columns.
+
+        The query is prepared once. The columns are converted like appended columns, and the values are bound
+        straight from the converted buffers in a native loop, so an execution costs little more than the work of the
+        engine. All executions run in one transaction.
+
+        Args:
+            operation: The SQL query, with qmark (?) parameters
+            columns: The values of every parameter, by parameter number starting at 0. Masked values are bound as
+                     null.
+            decimal: how to convert decimal result columns, see Cursor.fetchnumpy()
+
+        Returns:
+            The number of rows affected by every execution, or if the query returns rows, the rows of all executions
+            concatenated, like Cursor.fetchnumpy() returns them.
+        """
+        self._check()
+        statement, type_info = self.prepare_cached(operation)
+        start_transaction = not self.in_transaction
+        if start_transaction:
+            self.query("START TRANSACTION")
+        try:
+            try:
+                result = self._internal.execute_batch(statement, type_info, columns, decimal)  # type: ignore[union-attr]
+            finally:
+                # the rollback clears the statement cache, so give the statement back before it is cleaned up twice
+                self.release_statement(operation, statement)
+        except BaseException:
+            if start_transaction:
+                self.query("ROLLBACK")
+            raise
+        else:
+            if start_transaction:
+                self.query("COMMIT")
+        if isinstance(result, np.ndarray):
+            self.total_changes += int(result.sum())
+        return result
 
+    @serialized
     def get_port(self) -> Optional[int]:
         self._check()
         return self._internal.get_port()  # type: ignore[union-attr]
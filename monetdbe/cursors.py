@@ -1,26 +1,142 @@
 # mypy: disable-error-code="union-attr, arg-type, assignment"
-from typing import Optional, Iterable, Union, cast, Iterator, Dict, Sequence, TYPE_CHECKING, Any, List, Mapping
+from datetime import date, datetime, time
+from decimal import Decimal
+from itertools import chain, islice
+from typing import Optional, Iterable, Union, cast, Iterator, Dict, Sequence, TYPE_CHECKING, Any, List, Mapping, Tuple
 from warnings import warn
 import numpy as np
 import pandas as pd
-from monetdbe.connection import Connection, Description
+from monetdbe.connection import Connection, Description, serialized, serialized_iterator
 from monetdbe.exceptions import ProgrammingError, InterfaceError
-from monetdbe.formatting import format_query, strip_split_and_clean, parameters_type
+from monetdbe.formatting import format_query, strip_split_and_clean, parameters_type, query_template, \
+    parse_simple_insert
 from monetdbe.monetize import monet_identifier_escape
-from monetdbe.types import supported_numpy_types
+from monetdbe.types import supported_numpy_types, convertible_numpy_types
 
 if TYPE_CHECKING:
-    from monetdbe.row import Row
+    import pyarrow as pa
+    from monetdbe.row import Row, RowKeys
+    from monetdbe._cffi.internal import Result
 
 paramstyles = {"qmark", "numeric", "named", "format", "pyformat"}
 
 
 def _pandas_to_numpy_dict(df: pd.DataFrame) -> Dict[str, np.ndarray]:
-    return {label: np.array(column) for label, column in df.items()}  # type: ignore
+    """
+    Convert the columns of a DataFrame to numpy arrays. Missing values of nullable (extension) dtypes like Int64 and
+    boolean are masked, object and other extension columns become object arrays with None for missing values.
+    """
+    result: Dict[str, np.ndarray] = {}
+    for label, column in df.items():
+        numpy_type = getattr(column.dtype, 'numpy_dtype', None)
+        if isinstance(column.dtype, pd.api.extensions.ExtensionDtype) and numpy_type is not None and numpy_type.kind in 'biuf':
+            na_value = False if numpy_type.kind == 'b' else 0
+            result[label] = np.ma.masked_array(column.to_numpy(dtype=numpy_type, na_value=na_value),  # type: ignore
+                                               mask=column.isna().to_numpy())
+        elif column.dtype == object or isinstance(column.dtype, pd.api.extensions.ExtensionDtype):
+            result[label] = column.to_numpy(dtype=object, na_value=None)
+        else:
+            result[label] = np.array(column)
+    return result
+
+
+def _iterate(iterator: Iterator) -> Iterator:
+    """
+    Iterate over an object that only implements __next__.
+    """
+    while True:
+        try:
+            yield next(iterator)
+        except StopIteration:
+            return
+
+
+# the columns of a table that can be appended to without bypassing keys or triggers
+appendable_columns_query = """
+select s.name, c.name, c.type, c.type_digits, c.type_scale, c."null"
+from sys.columns c join sys.tables t on c.table_id = t.id join sys.schemas s on t.schema_id = s.id
+where t.name = ? and s.name = {schema} and t.type = 0
+  and not exists (select * from sys.keys k where k.table_id = t.id)
+  and not exists (select * from sys.triggers g where g.table_id = t.id)
+order by c.number
+"""
+
+# SQL type -> accepted python types, numpy type, value used for null
+appendable_types: Dict[str, Tuple[Tuple[type, ...], np.dtype, Any]] = {
+    'boolean': ((bool, np.bool_), np.dtype(np.bool_), False),
+    'tinyint': ((int, np.integer), np.dtype(np.int8), 0),
+    'smallint': ((int, np.integer), np.dtype(np.int16), 0),
+    'int': ((int, np.integer), np.dtype(np.int32), 0),
+    'bigint': ((int, np.integer), np.dtype(np.int64), 0),
+    'real': ((int, float, np.integer, np.floating), np.dtype(np.float32), 0),
+    'double': ((int, float, np.integer, np.floating), np.dtype(np.float64), 0),
+    'char': ((str,), np.dtype(object), None),
+    'varchar': ((str,), np.dtype(object), None),
+    'clob': ((str,), np.dtype(object), None),
+    'date': ((date, np.datetime64), np.dtype('datetime64[D]'), None),
+    'timestamp': ((datetime, np.datetime64), np.dtype('datetime64[us]'), None),
+    'time': ((time,), np.dtype(object), None),
+    'decimal': ((Decimal, int, np.integer), np.dtype(object), None),
+    'blob': ((bytes, bytearray, memoryview), np.dtype(object), None),
+}
+
+
+def _fits_decimal(value: Decimal, digits: int, scale: int) -> bool:
+    """
+    Check if a value can be stored in a decimal column without rounding or overflow.
+    """
+    return value.is_finite() and value.as_tuple().exponent >= -scale and abs(value) < Decimal(10) ** (digits - scale)  # type: ignore[operator]
+
+
+def _rows_to_arrays(rows: List[Sequence], names: List[str],
+                    columns: Mapping[str, Tuple[str, int, int, bool]]) -> Optional[Dict[str, np.ndarray]]:
+    """
+    Transpose parameter rows into numpy arrays, masked where a value is None.
+
+    Args:
+        rows: the parameter rows
+        names: the column name of every parameter
+        columns: the SQL type, number of digits, scale and nullability of every column
+
+    returns:
+        the arrays by column name, or None if a value can't be appended without changing its meaning
+    """
+    arrays: Dict[str, np.ndarray] = {}
+    for i, name in enumerate(names):
+        sql_type, digits, scale, nullable = columns[name]
+        if sql_type not in appendable_types:
+            return None
+        python_types, numpy_type, null = appendable_types[sql_type]
+
+        values = [row[i] for row in rows]
+        mask = [v is None or v is np.ma.masked for v in values]  # type: ignore[attr-defined]
+        has_nulls = any(mask)
+        if has_nulls and not nullable:
+            return None
+        if not all(m or (isinstance(v, python_types) and not getattr(v, 'tzinfo', None)) for v, m in zip(values, mask)):
+            return None
+        present = [v for v, m in zip(values, mask) if not m]
+        if sql_type in ('char', 'varchar', 'blob') and digits and any(len(v) > digits for v in present):
+            return None
+        if sql_type == 'decimal' and not all(_fits_decimal(Decimal(int(v)) if isinstance(v, np.integer) else Decimal(v),
+                                                           digits, scale) for v in present):
+            return None
+        if has_nulls:
+            values = [null if m else v for v, m in zip(values, mask)]
+
+        try:
+            array = np.array(values, dtype=numpy_type)
+        except (OverflowError, ValueError, TypeError):
+            return None
+        # datetime columns mark null with NaT, object columns with None
+        arrays[name] = np.ma.masked_array(array, mask=mask) if has_nulls and numpy_type.kind not in 'MO' else array
+    return arrays
 
 
 class Cursor:
     lastrowid = 0
+    # executemany() appends plain inserts of at least this many rows
+    append_threshold = 1000
 
     def __init__(self, con: 'Connection'):
 
@@ -33,10 +149,16 @@ class Cursor:
         self.connection: Optional[Connection] = con
         self.rowcount = -1
         self.prepare_id: Optional[int] = None
-        self.description: Optional[Description] = None
         self.row_factory = None
+        self.result: Optional['Result'] = None
 
+        # the name, type, digits and scale of every column of the result, saved by _save_columns()
+        self._columns: Optional[List[Tuple[str, int, int, int]]] = None
+        self._description: Optional[List[Description]] = None
         self._fetch_generator: Optional[Iterator['Row']] = None
+        # the column names shared by the Row objects made from the current result, see row_keys()
+        self._row_keys: Optional['RowKeys'] = None
+        con._cursors.add(self)
 
     def __enter__(self):
         return self
@@ -45,26 +167,70 @@ class Cursor:
         self.close()
 
     def __del__(self):
-        self.close()
+        # the garbage collector may run in any thread
+        self._close()
 
-    def _set_description(self):
-        self.description = self.connection.get_description()
+    @property
+    def description(self) -> Optional[List[Description]]:
+        """
+        The name, type, internal size, precision and scale of every column of the result of the last query, or None
+        if the query has no result. It is built from the result when it is first asked for.
+        """
+        if self._description is None:
+            self._save_columns()
+            if self._columns is not None:
+                self._description = self._describe(self._columns)
+        return self._description
+
+    @serialized
+    def _save_columns(self) -> None:
+        """
+        Save the name and type of the columns of the current result, so the description can still be built after the
+        result is released.
+        """
+        # we import this late, otherwise the whole monetdbe project is unimportable
+        # if we don't have access to monetdbe shared library
+        from monetdbe._cffi.convert import make_string
+
+        if self._columns is None and self.result:
+            self._columns = [(make_string(rcol.name), rcol.type, rcol.sql_type.digits, rcol.sql_type.scale)
+                             for rcol in map(self.result.fetch, range(self.result.ncols))]
+
+    @staticmethod
+    def _describe(columns: List[Tuple[str, int, int, int]]) -> List[Description]:
+        from monetdbe._cffi.convert import monet_c_type_map
+
+        descriptions = []
+        for name, type_, digits, scale in columns:
+            type_info = monet_c_type_map[type_]
+            # digits are the declared precision of numbers and the maximum length of strings, 0 if there is none
+            descriptions.append(Description(
+                name=name,
+                type_code=type_info.sql_type,
+                display_size=None,
+                internal_size=None if type_info.numpy_type.kind == 'O' else type_info.numpy_type.itemsize,
+                precision=digits or None,
+                scale=scale if digits else None,
+                null_ok=None,
+            ))
+        return descriptions
 
     def __iter__(self) -> Iterator[Union['Row', Sequence[Any]]]:
         # we import this late, otherwise the whole monetdbe project is unimportable
         # if we don't have access to monetdbe shared library
-        from monetdbe._cffi.convert import extract
-        from monetdbe._cffi.internal import result_fetch
+        from monetdbe._cffi.internal import result_fetch_rows
 
         self._check_connection()
 
-        if not self.connection.result:
-            raise StopIteration
+        # keep a reference to the result, so it stays alive while we iterate over it
+        result = self.result
+        if not result:
+            return
 
-        columns = list(map(lambda x: result_fetch(self.connection.result, x),
-                           range(self.connection.result.ncols)))  # type: ignore[union-attr]
-        for r in range(self.connection.result.nrows):
-            row = tuple(extract(rcol, r, self.connection.text_factory) for rcol in columns)
+        rows = result_fetch_rows(result, self.connection.text_factory)
+        if not self.connection.check_same_thread:
+            rows = serialized_iterator(self.connection, rows)
+        for row in rows:
             if self.connection.row_factory:
                 yield self.connection.row_factory(cur=self, row=row)
             elif self.row_factory:  # Sqlite backwards compatibly
@@ -81,6 +247,7 @@ class Cursor:
         """
         if not hasattr(self, 'connection') or not self.connection:
             raise ProgrammingError("no connection to lower level database available")
+        self.connection._check_thread()
 
     def _check_result(self) -> None:
         """
@@ -89,9 +256,17 @@ class Cursor:
         Raises:
             ProgrammingError: if no result is available.
         """
-        if not self.connection.result:
+        if not self.result:
             raise ProgrammingError("fetching data but no query executed")
 
+    def cleanup_result(self) -> None:
+        """
+        Release the result of the last query. The result data is freed as soon as no numpy array returned by
+        fetchnumpy() uses it anymore.
+        """
+        self.result = None
+        self._fetch_generator = None
+
     def _execute_python(self, operation: str, parameters: parameters_type = None) -> 'Cursor':
         """
         Execute operation with Python based statement preparation.
@@ -108,41 +283,82 @@ class Cursor:
         """
         self._check_connection()
 
-        self.description = None  # which will be set later in fetchall
+        self.cleanup_result()
+        self._columns = None
+        self._description = None
 
-        self.connection.cleanup_result()
-
-        splitted = strip_split_and_clean(operation)
-        if len(splitted) == 0:
+        if not isinstance(operation, str):
+            raise TypeError
+        template = query_template(operation)
+        if template.statements == 0:
             raise ProgrammingError("Empty query")
-        if len(splitted) > 1:
+        if template.statements > 1:
             raise ProgrammingError("Multiple queries in one execute() call")
 
         formatted = format_query(operation, parameters)
-        self.connection.result, self.rowcount = self.connection.query(formatted, make_result=True)
+        self.result, self.rowcount = self.connection.query(formatted, make_result=True)
         self.connection.total_changes += self.rowcount
-        self._set_description()
         return self
 
+    def _bind_and_execute(self, statement, type_info, parameters: parameters_type, make_result: bool):
+        from monetdbe._cffi.internal import bind
+        parameters = parameters or ()
+        if len(parameters) < len(type_info):
+            # a reused statement still has the values of its previous execution bound
+            raise ProgrammingError(f"Incorrect number of bindings supplied. The current statement uses "
+                                   f"{len(type_info)}, and there are {len(parameters)} supplied.")
+        # keep the bound values alive until the statement is executed
+        bound = [bind(statement, parameter, index, type_info) for index, parameter in enumerate(parameters)]
+        return self.connection.execute_statement(statement, make_result=make_result)
+
+    def _append_rows(self, insert: Tuple[Optional[str], str, Optional[List[str]], int], rows: List) -> bool:
+        """
+        Try to insert parameter rows with a single append().
+
+        returns:
+            False if the rows could not be appended and need to be inserted one by one
+        """
+        schema, table, names, n_parameters = insert
+        if not all(isinstance(row, Sequence) and len(row) == n_parameters for row in rows):
+            return False
+
+        query = appendable_columns_query.format(schema="?" if schema else "current_schema")
+        cursor = self.connection.cursor().execute(query, (table, schema) if schema else (table,))
+        table_columns = cursor.fetchall()
+        cursor.close()
+        if not table_columns:
+            return False
+
+        schema = table_columns[0][0]
+        columns = {name: (sql_type, digits, scale, bool(nullable))
+                   for _, name, sql_type, digits, scale, nullable in table_columns}
+        names = names or [name for _, name, _, _, _, _ in table_columns]
+        if len(names) != n_parameters or sorted(names) != sorted(columns):
+            # append() needs a value for every column
+            return False
+
+        data = _rows_to_arrays(rows, names, columns)
+        if data is None:
+            return False
+        self.connection.append(schema=schema, table=table, data=data)
+        return True
+
     def _execute_monetdbe(self, operation: str, parameters: parameters_type = None):
-        from monetdbe._cffi.internal import bind, execute
         self._check_connection()
-        prepare_result = self.connection.prepare(operation)
-        statement = prepare_result[0]
-
-        self.connection.type_info = None
-        if len(prepare_result) == 2:
-            self.connection.type_info = prepare_result[1]
-
-        if parameters:
-            for index, parameter in enumerate(parameters):
-                bind(statement, parameter, index, self.connection.type_info)
-        self.connection.result, self.rowcount = execute(statement, make_result=True)
-        self.connection.cleanup_statement(statement)
+        self.cleanup_result()
+        self._columns = None
+        self._description = None
+        statement, type_info = self.connection.prepare_cached(operation)
+        self.connection.type_info = type_info
+
+        try:
+            self.result, self.rowcount = self._bind_and_execute(statement, type_info, parameters, make_result=True)
+        finally:
+            self.connection.release_statement(operation, statement)
         self.connection.total_changes += self.rowcount
-        self._set_description()
         return self
 
+    @serialized
     def execute(
             self,
             operation: str,
@@ -151,11 +367,17 @@ class Cursor:
     ) -> 'Cursor':
         if paramstyle not in paramstyles:
             raise ValueError(f"Unknown paramstyle {paramstyle}")
-        if (not parameters or isinstance(parameters, Sequence)) and paramstyle == "qmark":
+        if isinstance(operation, str) and isinstance(parameters, (Sequence, Mapping)):
+            template = query_template(operation)
+            if template.statements == 1 and any(kind != 'qmark' for kind, _ in template.placeholders):
+                # the other paramstyles are rewritten to qmark, so their values are bound instead of formatted in
+                return self._execute_monetdbe(template.qmark, template.values(parameters))
+        if not parameters or isinstance(parameters, Sequence):
             return self._execute_monetdbe(operation, parameters)
         return self._execute_python(operation, parameters)
 
-    def executemany(self, operation: str, seq_of_parameters: Union[Iterator, Iterable[Iterable]]) -> 'Cursor':
+    @serialized
+    def executemany(self, operation: str, seq_of_parameters: Union[Iterator, Iterable[parameters_type]]) -> 'Cursor':
         """
         Prepare a database operation (query or command) and then execute it against all parameter sequences or
         mappings found in the sequence seq_of_parameters.
@@ -165,8 +387,9 @@ class Cursor:
             seq_of_parameters: An optional iterator or iterable containing an iterable of arguments
         """
         self._check_connection()
-        self.description = None  # which will be set later in fetchall
-        self.connection.cleanup_result()
+        self.cleanup_result()
+        self._columns = None
+        self._description = None
         total_affected_rows = 0
 
         if operation[:6].lower().strip() == 'select':
@@ -175,31 +398,72 @@ class Cursor:
         if hasattr(seq_of_parameters, '__iter__'):
             iterator = iter(seq_of_parameters)
         else:
-            iterator = seq_of_parameters  # type: ignore   # mypy gets confused here
-
-        while True:
-            try:
-                parameters = next(iterator)
-            except StopIteration:
-                break
-
-            formatted = format_query(operation, parameters)
-            self.connection.result, affected_rows = self.connection.query(formatted, make_result=True)
-            total_affected_rows += affected_rows
+            iterator = _iterate(seq_of_parameters)  # type: ignore   # mypy gets confused here
+
+        # the query is prepared once and executed for every row, other paramstyles are rewritten to qmark first
+        template = query_template(operation)
+        rewrite = template.statements == 1 and any(kind != 'qmark' for kind, _ in template.placeholders)
+        prepared = template.qmark if rewrite else operation
+        insert = None if rewrite else parse_simple_insert(operation)
+        statement = None
+
+        start_transaction = not self.connection.in_transaction
+        if start_transaction:
+            self.connection.query("START TRANSACTION")
+        try:
+            if insert:
+                # large batches of a plain insert are transposed into columns and appended at once
+                buffered = list(islice(iterator, self.append_threshold))
+                if len(buffered) == self.append_threshold:
+                    buffered.extend(iterator)
+                    if self._append_rows(insert, buffered):
+                        total_affected_rows, buffered = len(buffered), []
+                iterator = chain(buffered, iterator)
+
+            for parameters in iterator:
+                if rewrite and isinstance(parameters, (Sequence, Mapping)):
+                    parameters = template.values(parameters)
+                if isinstance(parameters, Sequence):
+                    if statement is None:
+                        statement, type_info = self.connection.prepare_cached(prepared)
+                    _, affected_rows = self._bind_and_execute(statement, type_info, parameters, make_result=False)
+                else:
+                    formatted = format_query(operation, parameters)
+                    _, affected_rows = self.connection.query(formatted)
+                total_affected_rows += affected_rows
+        except BaseException:
+            # the rollback clears the statement cache, so give the statement back before it is cleaned up twice
+            if statement is not None:
+                self.connection.release_statement(prepared, statement)
+                statement = None
+            if start_transaction:
+                self.connection.query("ROLLBACK")
+            raise
+        else:
+            if start_transaction:
+                self.connection.query("COMMIT")
+        finally:
+            if statement is not None:
+                self.connection.release_statement(prepared, statement)
 
         self.rowcount = total_affected_rows
         self.connection.total_changes += total_affected_rows
-        self._set_description()
         return self
 
     def close(self) -> None:
         """
         Shut down the connection.
         """
-        if hasattr(self, 'connection') and self.connection and self.connection.result:
-            self.connection.cleanup_result()
+        if hasattr(self, 'connection') and self.connection:
+            self.connection._check_thread()
+        self._close()
+
+    def _close(self) -> None:
+        self.result = None
+        self._fetch_generator = None
         self.connection = None
 
+    @serialized
     def executescript(self, sql_script: str) -> None:
         """
         This is a nonstandard convenience and SQLite compatibility method for executing multiple SQL statements at once.
@@ -220,6 +484,7 @@ class Cursor:
         for query in strip_split_and_clean(sql_script):
             self.execute(query)
 
+    @serialized
     def create(self, table, values, schema=None):
         """
         Creates a table from a set of values or a pandas DataFrame.
@@ -284,7 +549,9 @@ class Cursor:
         query = f"insert into {schema}.{table} ({columns}) values ({qmarks})"
         return self.executemany(query, rows_zipped)
 
-    def insert(self, table: str, values: Union[pd.DataFrame, Mapping[str, np.ndarray]], schema: str = 'sys'):
+    @serialized
+    def insert(self, table: str, values: Union[pd.DataFrame, Mapping[str, np.ndarray]], schema: str = 'sys',
+               chunk_size: Optional[int] = None):
         """
         Inserts a set of values into the specified table.
 
@@ -292,6 +559,7 @@ class Cursor:
             table: The table to insert into
             values: The values. must be either a pandas DataFrame or a dictionary of values.
             schema: The SQL schema to use. If no schema is specified, the "sys" schema is used.
+            chunk_size: Append this many rows at a time, see Connection.append()
        """
         if isinstance(values, pd.DataFrame):
             prepared = _pandas_to_numpy_dict(values)
@@ -302,11 +570,11 @@ class Cursor:
             if not isinstance(value, (np.ma.core.MaskedArray, np.ndarray)):  # type: ignore
                 prepared[key] = np.array(value)
 
-        if sum(i.dtype.kind not in supported_numpy_types for i in prepared.values()):  # type: ignore
+        if sum(i.dtype.kind not in supported_numpy_types + convertible_numpy_types for i in prepared.values()):  # type: ignore
             warn(
-                "One of the columns you are inserting is not of type int or float which fast append doesn't support. Falling back to regular insert.")
+                "One of the columns you are inserting is of a type which fast append doesn't support. Falling back to regular insert.")
             return self._insert_slow(table, prepared, schema)
-        return self.connection.append(schema=schema, table=table, data=prepared)
+        return self.connection.append(schema=schema, table=table, data=prepared, chunk_size=chunk_size)
 
     def setoutputsize(self, *args, **kwargs) -> None:
         """
@@ -359,16 +627,51 @@ class Cursor:
         values = pd.read_csv(*args, **kwargs)
         return self.create(table=table, values=values)
 
-    def fetchdf(self) -> pd.DataFrame:
+    @serialized
+    def fetchdf(self, decimal: str = 'float64', threads: Optional[int] = None) -> pd.DataFrame:
         """
         Fetch all results and return a Pandas DataFrame.
 
         like .fetchall(), but returns a Pandas DataFrame.
+
+        Args:
+            decimal: how to convert decimal columns, see .fetchnumpy()
+            threads: the number of threads to convert columns on, see .fetchnumpy()
+        """
+        self._check_connection()
+        self._check_result()
+        return pd.DataFrame(cast(pd.DataFrame, self.fetchnumpy(decimal, threads)))  # cast to make mypy happy
+
+    def fetchdf_batches(self, rows: int = 100_000, decimal: str = 'float64',
+                        threads: Optional[int] = None) -> Iterator[pd.DataFrame]:
+        """
+        Fetch the results in batches and return an iterator of Pandas DataFrames.
+
+        like .fetchnumpy_batches(), but yields Pandas DataFrames.
+
+        Args:
+            rows: the maximum number of rows per DataFrame
+            decimal: how to convert decimal columns, see .fetchnumpy()
+            threads: the number of threads to convert columns on, see .fetchnumpy()
         """
+        return (pd.DataFrame(cast(pd.DataFrame, batch)) for batch in self.fetchnumpy_batches(rows, decimal, threads))
+
+    @serialized
+    def fetch_arrow(self) -> 'pa.Table':
+        """
+        Fetch all results and return an Apache Arrow table.
+
+        like .fetchnumpy(), but returns a pyarrow Table. Integer and floating point columns are not copied but share
+        memory with the result. Decimal, boolean, date, time and timestamp columns are converted into new buffers,
+        string and blob columns are copied into Arrow offsets and data buffers directly. Requires pyarrow.
+        """
+        from monetdbe._cffi.arrow import result_fetch_arrow
+
         self._check_connection()
         self._check_result()
-        return pd.DataFrame(cast(pd.DataFrame, self.fetchnumpy()))  # cast to make mypy happy
+        return result_fetch_arrow(self.result)
 
+    @serialized
     def fetchmany(self, size=None):
         """
         Fetch the next set of rows of a query result, returning a list of tuples). An empty sequence is returned when
@@ -386,7 +689,7 @@ class Cursor:
         self._check_connection()
         # self._check_result() sqlite test suite doesn't want us to bail out
 
-        if not self.connection.result:
+        if not self.result:
             return []
 
         if not size:
@@ -402,6 +705,7 @@ class Cursor:
                 break
         return rows
 
+    @serialized
     def fetchone(self) -> Optional[Union['Row', Sequence]]:
         """
         Fetch the next row of a query result set, returning a single tuple, or None when no more data is available.
@@ -416,7 +720,7 @@ class Cursor:
         self._check_connection()
         # self._check_result() sqlite test suite doesn't want us to bail out
 
-        if not self.connection.result:
+        if not self.result:
             return None
 
         if not self._fetch_generator:
@@ -440,6 +744,7 @@ class Cursor:
             else:
                 yield tuple(row)
 
+    @serialized
     def fetchall(self) -> List[Union['Row', Sequence]]:
         """
         Fetch all (remaining) rows of a query result, returning them as a list of tuples).
@@ -458,11 +763,12 @@ class Cursor:
         if not self.connection.consistent:
             raise InterfaceError("Tranaction rolled back, state inconsistent")
 
-        if not self.connection.result:
+        if not self.result:
             return []
 
         rows = [i for i in self]
-        self.connection.cleanup_result()
+        self._save_columns()
+        self.cleanup_result()
         return rows
 
     def _fetchnumpy_slow(self) -> Mapping[str, np.ndarray]:
@@ -479,14 +785,51 @@ class Cursor:
             return list(np.vstack(list(result.values())).T)
         return []
 
-    def fetchnumpy(self) -> Mapping[str, np.ndarray]:
+    @serialized
+    def fetchnumpy(self, decimal: str = 'float64', threads: Optional[int] = None) -> Mapping[str, np.ndarray]:
         """
         Fetch all results and return a numpy array.
 
-        like .fetchall(), but returns a numpy array.
+        like .fetchall(), but returns a numpy array. Numeric columns are not copied but share memory with the
+        result, which is kept alive as long as the arrays are in use. They stay valid until the connection is closed.
+
+        Args:
+            decimal: how to convert decimal columns. 'float64' (default) returns the scaled values as floats,
+                     'int_scaled' returns the unscaled integers with the scale stored in the metadata of the
+                     dtype (``array.dtype.metadata['scale']``) and 'object' returns exact python Decimal objects.
+            threads: convert the columns in parallel on this many threads. String and temporal columns are
+                     converted natively without holding the GIL, so wide results with such columns come back faster.
+                     By default the columns are converted one by one.
         """
         from monetdbe._cffi.internal import result_fetch_numpy
 
         self._check_connection()
         self._check_result()
-        return result_fetch_numpy(self.connection.result)  # type: ignore[union-attr]
+        return result_fetch_numpy(self.result, decimal=decimal, threads=threads)  # type: ignore[arg-type]
+
+    def fetchnumpy_batches(self, rows: int = 100_000, decimal: str = 'float64',
+                           threads: Optional[int] = None) -> Iterator[Mapping[str, np.ndarray]]:
+        """
+        Fetch the results in batches and return an iterator of numpy arrays.
+
+        like .fetchnumpy(), but every batch only converts a slice of the rows of the result, which limits the memory
+        required for columns that can't be used without conversion, like strings and timestamps.
+
+        Args:
+            rows: the maximum number of rows per batch
+            decimal: how to convert decimal columns, see .fetchnumpy()
+            threads: the number of threads to convert columns on, see .fetchnumpy()
+        """
+        from monetdbe._cffi.internal import result_fetch_numpy, decimal_options
+
+        self._check_connection()
+        self._check_result()
+        if rows < 1:
+            raise ValueError("rows should be a positive number")
+        if decimal not in decimal_options:
+            raise ValueError(f"decimal should be one of {', '.join(decimal_options)}, not '{decimal}'")
+        if threads is not None and threads < 1:
+            raise ValueError("threads should be a positive number")
+        result = self.result
+        batches = (result_fetch_numpy(result, start, start + rows, decimal, threads) for start in range(0, result.nrows, rows))
+        return serialized_iterator(self.connection, batches)
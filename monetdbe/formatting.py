@@ -1,6 +1,7 @@
-from re import compile, sub, DOTALL
-from string import Formatter
-from typing import Dict, Optional, Union, Iterable, Any, List, Sized, Collection, Sequence, Mapping
+from functools import lru_cache
+from itertools import chain
+from re import compile, sub, findall, DOTALL, IGNORECASE, VERBOSE
+from typing import Dict, Optional, Union, Iterable, Any, List, Sized, Collection, Sequence, Mapping, Tuple
 
 from monetdbe.exceptions import ProgrammingError
 from monetdbe.monetize import convert
@@ -8,14 +9,15 @@ from monetdbe.monetize import convert
 # use this pattern to split a string on non-escaped semicolumns
 semicolumn_split_pattern = compile(r'''((?:[^;"']|"[^"]*"|'[^']*')+)''')
 
+identifier_pattern = r'(?:\w+|"[^"]+")'
 
-def remove_quoted_substrings(query: str):
-    """
-    This removes all quoted substrings. Note that this likely results in a broken query.
-    """
-    q = sub(r"\\'", "", query)  # first remove escaped quotes
-    q = sub(r"'(.*)'", "", q)  # then remove all quotes strings
-    return q
+# an INSERT INTO [schema.]table [(columns)] VALUES (?, ...) with only qmark parameters
+simple_insert_pattern = compile(
+    rf'^\s*insert\s+into\s+(?:(?P<schema>{identifier_pattern})\s*\.\s*)?(?P<table>{identifier_pattern})\s*'
+    rf'(?:\((?P<columns>\s*{identifier_pattern}\s*(?:,\s*{identifier_pattern}\s*)*)\))?\s*'
+    r'values\s*\((?P<values>\s*\?\s*(?:,\s*\?\s*)*)\)\s*;?\s*$',
+    flags=IGNORECASE
+)
 
 
 def strip_split_and_clean(script: str):
@@ -38,100 +40,159 @@ def strip_split_and_clean(script: str):
     return results
 
 
-def escape(v):
-    return f"'{v}'"
+def _unquote_identifier(identifier: str) -> str:
+    identifier = identifier.strip()
+    if identifier.startswith('"'):
+        return identifier[1:-1]
+    return identifier.lower()
 
 
-class DefaultFormatter(Formatter):
-    """
-    This makes it possible to supply a dict with a __missing__() method (like a defaultdict)
+def parse_simple_insert(query: str) -> Optional[Tuple[Optional[str], str, Optional[List[str]], int]]:
     """
+    Recognize a plain INSERT statement that only has qmark parameters as values.
 
-    def __init__(self, d: Dict):
-        super().__init__()
-        self.d = d
-
-    def get_value(self, key, *args, **kwargs):
-        s = self.d[key]
-        if isinstance(s, str):
-            return escape(s)
-        else:
-            return s
+    returns:
+        schema (None if not given), table, column names (None if not given) and the number of parameters, or None
+        if the query is not such a statement
+    """
+    match = simple_insert_pattern.match(query)
+    if not match:
+        return None
+    schema, table, columns, values = match.group('schema', 'table', 'columns', 'values')
+    return (
+        _unquote_identifier(schema) if schema else None,
+        _unquote_identifier(table),
+        [_unquote_identifier(c) for c in findall(identifier_pattern, columns)] if columns else None,
+        values.count('?'),
+    )
 
 
 parameters_type = Optional[Union[Sequence[Any], Dict[str, Any]]]
 
+# the parts of a query that matter for finding its parameter placeholders
+template_token_pattern = compile(r"""
+    (?P<quoted>'(?:[^'\\]|\\.)*'|"[^"]*")
+    |(?P<comment>--[^\n]*|/\*.*?\*/)
+    |(?P<separator>;)
+    |(?P<cast>::)
+    |(?P<qmark>\?)
+    |:(?P<numeric>\d+)
+    |:(?P<named>[^\W\d]\w*)
+    |(?P<format>%s)
+    |%\((?P<pyformat>[^)]+)\)s
+""", flags=VERBOSE | DOTALL)
 
-def _format_mapping(cleaned_query: str, parameters: Dict[str, Any], query: str):
-    if '?' in cleaned_query:
-        raise ProgrammingError("'?' in formatting with mapping as parameters")
+placeholder_symbols = {'qmark': '?', 'numeric': ':', 'named': ':', 'format': '%s', 'pyformat': '%'}
 
-    escaped: Dict[str, str] = {k: convert(v) for k, v in parameters.items()}
 
-    if ':' in cleaned_query:  # qmark
-        x = sub(r':(\w+)', r'{\1}', query)
-    elif '%' in cleaned_query:
-        return query % escaped
+class QueryTemplate:
+    """
+    A query split into its SQL text and its parameter placeholders. Placeholders in quoted strings, quoted identifiers
+    and comments are ignored. Use query_template() to get one, so every distinct query is only parsed once.
 
-    if hasattr(type(parameters), '__missing__'):
-        # this is something like a dict with a default value
+    Placeholders are qmark (?), numeric (:1), named (:name), format (%s) or pyformat (%(name)s) style. Positional
+    placeholders have the index of their parameter as key, named placeholders the name of their parameter. The qmark
+    attribute is the query with every placeholder replaced by a ?, which can be prepared and bound to values().
+    """
+    __slots__ = ('parts', 'placeholders', 'statements', 'qmark')
+
+    def __init__(self, query: str):
+        self.parts: List[str] = []
+        self.placeholders: List[Tuple[str, Union[int, str]]] = []
+        self.statements = 0
+
+        content = False
+        start = end = 0
+        positional = 0
+        for match in template_token_pattern.finditer(query):
+            kind = match.lastgroup
+            content = content or bool(query[end:match.start()].strip())
+            end = match.end()
+            if kind == 'separator':
+                self.statements += content
+                content = False
+            elif kind != 'comment':
+                content = True
+            if kind not in placeholder_symbols:
+                continue
+
+            key: Union[int, str]
+            if kind in ('qmark', 'format'):
+                key = positional
+                positional += 1
+            elif kind == 'numeric':
+                key = int(match.group(kind)) - 1
+            else:
+                key = match.group(kind)
+            self.parts.append(query[start:match.start()])
+            self.placeholders.append((kind, key))
+            start = end
+        self.parts.append(query[start:])
+        self.statements += content or bool(query[end:].strip())
+
+        if any(kind in ('format', 'pyformat') for kind, _ in self.placeholders):
+            # like with the % operator, %% is an escaped %
+            self.parts = [part.replace('%%', '%') for part in self.parts]
+        self.qmark = '?'.join(self.parts)
+
+    def values(self, parameters: Union[Sequence[Any], Mapping[str, Any]]) -> List[Any]:
+        """
+        The parameter of every placeholder.
+
+        Raises:
+            ProgrammingError: if the parameters don't fit the placeholders
+        """
+        if isinstance(parameters, Mapping):
+            for kind, key in self.placeholders:
+                if isinstance(key, int):
+                    raise ProgrammingError(f"'{placeholder_symbols[kind]}' in formatting with mapping as parameters")
+        else:
+            counted = [kind for kind, _ in self.placeholders if kind in ('qmark', 'format')]
+            if counted and len(counted) != len(parameters):
+                raise ProgrammingError(f"Number of arguments ({len(parameters)}) doesn't "
+                                       f"match number of '{placeholder_symbols[counted[0]]}' ({len(counted)})")
+            for kind, key in self.placeholders:
+                if isinstance(key, str):
+                    raise ProgrammingError(f"Named parameter '{key}' in formatting with sequence as parameters")
+                if not 0 <= key < len(parameters):
+                    raise ProgrammingError(f"No value given for parameter :{key + 1}")
         try:
-            # mypy doesn't understand that this is a dict-like with a default __missing__ value
-            return DefaultFormatter(parameters).format(x, **escaped)
+            return [parameters[key] for _, key in self.placeholders]  # type: ignore[index]
         except KeyError as e:
-            raise ProgrammingError(e)
-    try:
-        return x.format(**escaped)
-    except KeyError as e:
-        raise ProgrammingError(e)
-
-
-def _format_iterable(cleaned_query: str, parameters: Sequence[Any], query: str):
-    # we do this a bit strange to make sure the test_ExecuteParamSequence sqlite test passes
-    escaped_list: List[str] = [convert(parameters[i]) for i in range(len(parameters))]
+            raise ProgrammingError(f"No value given for parameter {e}")
 
-    if ':' in cleaned_query:
-        x = sub(r':(\w+)', r'{\1}', query)
+    def format(self, parameters: Union[Sequence[Any], Mapping[str, Any]]) -> str:
+        """
+        The query with the escaped parameters filled in.
+        """
+        if not self.placeholders:
+            return self.parts[0]
+        escaped = [convert(value) for value in self.values(parameters)]
+        return ''.join(chain.from_iterable(zip(self.parts, escaped))) + self.parts[-1]
 
-        # The numbering used starts at 1, while python starts 0, so we insert a bogus prefix
-        prefixed = [''] + escaped_list
 
-        return x.format(*prefixed)
-
-    if '?' in cleaned_query:  # qmark style
-
-        if cleaned_query.count('?') != len(escaped_list):
-            raise ProgrammingError(f"Number of arguments ({len(escaped_list)}) doesn't "
-                                   f"match number of '?' ({cleaned_query.count('?')})")
-
-        return query.replace('?', '{}').format(*escaped_list)
-    elif '%s' in cleaned_query:  # pyformat style
-        return query % tuple(escaped_list)
-    else:
-        return cleaned_query
+@lru_cache(maxsize=512)
+def query_template(query: str) -> QueryTemplate:
+    """
+    The parsed template of a query, from a cache of recently used queries.
+    """
+    return QueryTemplate(query)
 
 
 def format_query(query: str, parameters: parameters_type = None) -> str:
     if not isinstance(query, str):
         raise TypeError
 
-    cleaned_query = remove_quoted_substrings(query)
+    template = query_template(query)
 
     if parameters is None:
-        for symbol in ':?':
-            if symbol in cleaned_query:
-                raise ProgrammingError(f"unexpected symbol '{symbol}' in operation")
+        for kind, _ in template.placeholders:
+            if kind in ('qmark', 'numeric', 'named'):
+                raise ProgrammingError(f"unexpected symbol '{placeholder_symbols[kind]}' in operation")
         return query
 
-    # named, numeric or format style
-    if isinstance(parameters, Dict):
-        return _format_mapping(cleaned_query, parameters, query)
-
-    # qmark or pyformat style
-    elif isinstance(parameters, Sequence) or (isinstance(parameters, Sized) and hasattr(parameters, '__getitem__')):
-        return _format_iterable(cleaned_query, parameters, query)
-
+    if isinstance(parameters, Mapping) or isinstance(parameters, Sequence) or \
+            (isinstance(parameters, Sized) and hasattr(parameters, '__getitem__')):
+        return template.format(parameters)
     else:
         raise ValueError(f"parameters '{parameters}' type '{type(parameters)}' not supported")
-
-
@@ -64,6 +64,13 @@ def monet_datetime(data: Any) -> str:
         return f"'{data}'"
 
 
+def monet_timedelta(data: Any) -> str:
+    if np.isnat(data):  # type: ignore
+        return 'NULL'
+    else:
+        return f"'{data.astype(datetime.timedelta)}'"
+
+
 mapping: List[Tuple[Type, Callable]] = [
     (str, monet_escape),
     (bytes, monet_bytes),
@@ -90,6 +97,7 @@ mapping: List[Tuple[Type, Callable]] = [
     (np.float64, monet_float),
     (np.float32, monet_float),
     (np.datetime64, monet_datetime),  # type: ignore
+    (np.timedelta64, monet_timedelta),  # type: ignore
     (np.ma.core.MaskedConstant, monet_none),  # type: ignore
 ]
 
@@ -0,0 +1,185 @@
+"""
+This module contains a pool of reusable connections.
+"""
+from collections import deque
+from contextlib import contextmanager
+from pathlib import Path
+from threading import Condition
+from time import monotonic
+from typing import Optional, Union, Deque, Iterator, Any, Dict, Set
+
+from monetdbe import dbapi2, exceptions
+from monetdbe.connection import Connection
+
+
+class ConnectionPool:
+    def __init__(self,
+                 database: Optional[Union[str, Path]] = None,
+                 min_size: int = 1,
+                 max_size: int = 10,
+                 autocommit: bool = False,
+                 **kwargs: Any):
+        """
+        A pool of open connections to a database, which saves the cost of opening a connection for every unit of
+        work. The pool can be used from multiple threads; a connection that is handed out belongs to the thread that
+        acquired it until it is released.
+
+        Released connections are reset before they are handed out again: an open transaction is rolled back, the
+        current result is released, autocommit is set back to the pool setting and the row and text factories are
+        cleared. Rolling back clears the prepared statement cache of the connection, so prepared statements are only
+        kept between checkouts if no transaction is open when the connection is released, e.g. in autocommit mode.
+
+        Args:
+            database: The path to the database, see monetdbe.connect(). Multiple connections to the same in-memory
+                      database are not possible, so pools are meant for databases on disk.
+            min_size: The number of connections that are opened up front and kept open
+            max_size: The maximum number of connections that are open at the same time
+            autocommit: The autocommit mode of the connections handed out
+            kwargs: Other arguments for monetdbe.connect()
+        """
+        if min_size < 0 or max_size < 1 or min_size > max_size:
+            raise ValueError("the pool sizes should satisfy 0 <= min_size <= max_size and max_size > 0")
+        self.min_size = min_size
+        self.max_size = max_size
+        self._database = database
+        self._autocommit = autocommit
+        # connections are opened and released by whichever thread happens to need one
+        kwargs.setdefault('check_same_thread', False)
+        self._kwargs: Dict[str, Any] = kwargs
+        self._idle: Deque[Connection] = deque()
+        self._in_use: Set[Connection] = set()
+        self._size = 0
+        self._closed = False
+        self._condition = Condition()
+
+        try:
+            for _ in range(min_size):
+                self._idle.append(self._open())
+                self._size += 1
+        except BaseException:
+            self.close()
+            raise
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+
+    def _open(self) -> Connection:
+        return dbapi2.connect(self._database, autocommit=self._autocommit, **self._kwargs)
+
+    def _reset(self, connection: Connection) -> None:
+        connection.cleanup_result()
+        if connection.in_transaction:
+            connection.query("ROLLBACK")
+        connection.set_autocommit(self._autocommit)
+        connection.consistent = True
+        connection.row_factory = None
+        connection.text_factory = None
+
+    @property
+    def size(self) -> int:
+        """
+        The number of open connections, handed out or idle.
+        """
+        return self._size
+
+    @property
+    def idle(self) -> int:
+        """
+        The number of open connections that are waiting to be handed out.
+        """
+        return len(self._idle)
+
+    def acquire(self, timeout: Optional[float] = None) -> Connection:
+        """
+        Take a connection from the pool. If all connections are in use and the pool is at its maximum size, wait for
+        a connection to be released.
+
+        Args:
+            timeout: The maximum number of seconds to wait, wait indefinitely by default
+
+        Raises:
+            OperationalError: If the pool is closed, or no connection became available in time.
+        """
+        deadline = None if timeout is None else monotonic() + timeout
+        with self._condition:
+            while True:
+                if self._closed:
+                    raise exceptions.OperationalError("The connection pool has been closed")
+                if self._idle:
+                    connection = self._idle.pop()
+                    self._in_use.add(connection)
+                    return connection
+                if self._size < self.max_size:
+                    # reserve the slot and open the connection without holding the lock
+                    self._size += 1
+                    break
+                remaining = None if deadline is None else deadline - monotonic()
+                if remaining is not None and remaining <= 0:
+                    raise exceptions.OperationalError("Timed out waiting for a connection from the pool")
+                self._condition.wait(remaining)
+
+        try:
+            connection = self._open()
+        except BaseException:
+            with self._condition:
+                self._size -= 1
+                self._condition.notify()
+            raise
+        with self._condition:
+            self._in_use.add(connection)
+        return connection
+
+    def release(self, connection: Connection) -> None:
+        """
+        Reset a connection and return it to the pool. Connections that are closed or fail to reset are discarded.
+
+        Raises:
+            ProgrammingError: If the connection was not acquired from this pool, or has already been released.
+        """
+        with self._condition:
+            if connection not in self._in_use:
+                raise exceptions.ProgrammingError("The connection is not handed out by this pool")
+            self._in_use.remove(connection)
+
+        reusable = not self._closed and connection._internal is not None
+        if reusable:
+            try:
+                self._reset(connection)
+            except Exception:
+                reusable = False
+        if not reusable:
+            connection.close()
+            with self._condition:
+                self._size -= 1
+                self._condition.notify()
+            return
+
+        with self._condition:
+            self._idle.append(connection)
+            self._condition.notify()
+
+    @contextmanager
+    def connection(self, timeout: Optional[float] = None) -> Iterator[Connection]:
+        """
+        Acquire a connection for the duration of a with block, and release it afterwards.
+        """
+        connection = self.acquire(timeout)
+        try:
+            yield connection
+        finally:
+            self.release(connection)
+
+    def close(self) -> None:
+        """
+        Close the idle connections. Connections that are handed out are closed when they are released.
+        """
+        with self._condition:
+            self._closed = True
+            idle, self._idle = self._idle, deque()
+            self._size -= len(idle)
+            self._condition.notify_all()
+        for connection in idle:
+            connection.close()
@@ -1,11 +1,46 @@
 """
-
+Row factories: the Row class and the dict_row and namedtuple_row functions. Set one as the row_factory of a connection
+or cursor to get the rows of a result as something else than tuples.
 """
 import collections.abc
-from typing import Union, Generator, Optional, Any, Tuple, TYPE_CHECKING
+from collections import namedtuple
+from typing import Union, Generator, Optional, Any, Tuple, Dict, List, Type
+
+from monetdbe.connection import Description
+from monetdbe.cursors import Cursor  # type: ignore[attr-defined]
+
+
+class RowKeys:
+    """
+    The column names of a result and their indices, built once per description and shared by all its rows.
+    """
+    __slots__ = ('description', 'names', 'index', '_namedtuple')
 
-if TYPE_CHECKING:
-    from monetdbe import Cursor  # type: ignore[attr-defined]
+    def __init__(self, description: Optional[List[Description]]):
+        self.description = description
+        self.names: Tuple[str, ...] = tuple(d.name for d in description) if description else tuple()
+        self.index: Dict[str, int] = dict(zip(self.names, range(len(self.names))))
+        self._namedtuple: Optional[Type[tuple]] = None
+
+    @property
+    def namedtuple(self) -> Type[tuple]:
+        """
+        A namedtuple class with a field for every column. Names that are not valid field names are replaced.
+        """
+        if self._namedtuple is None:
+            self._namedtuple = namedtuple('Row', self.names, rename=True)  # type: ignore[misc]
+        return self._namedtuple
+
+
+def row_keys(cur: Cursor) -> RowKeys:
+    """
+    The keys of the current result of a cursor, rebuilt only when the cursor has a new description.
+    """
+    description = cur.description
+    keys = getattr(cur, '_row_keys', None)
+    if keys is None or keys.description is not description:
+        keys = cur._row_keys = RowKeys(description)
+    return keys
 
 
 class Row:
@@ -16,35 +51,27 @@ class Row:
 
     If two Row objects have exactly the same columns and their members are equal, they compare equal.
     """
+    __slots__ = ('_row', '_keys')
 
-    def __init__(self, cur: 'Cursor', row: Union[tuple, Generator[Optional[Any], Any, None]]):
-        from monetdbe import Cursor
+    def __init__(self, cur: Cursor, row: Union[tuple, Generator[Optional[Any], Any, None]]):
         if type(cur) is not Cursor:
             raise TypeError("You need to supply a subclass of Cursor as a cursor.")
 
-        self._cur = cur
         self._row = tuple(row)
-
-        if hasattr(self._cur, "description") and self._cur.description:
-            self._keys = tuple(i.name for i in self._cur.description)
-        else:
-            self._keys = tuple()
-
-        self._key_map = dict(zip(self._keys, range(len(self._keys))))
+        self._keys = row_keys(cur)
 
     def __hash__(self):
-        return hash(self._keys) ^ hash(self._keys)
+        return hash(self._keys.names) ^ hash(self._keys.names)
 
     def __eq__(self, other) -> bool:
         if isinstance(other, type(self)):
-            a = self._keys == other._keys
+            a = self._keys.names == other._keys.names
             b = self._row == other._row
             return a & b
         else:
             return False
 
     def __iter__(self):
-        # return zip(self.cur.description.__iter__(), self.row.__iter__())
         return self._row.__iter__()
 
     def __len__(self):
@@ -55,13 +82,27 @@ class Row:
             return self._row.__getitem__(item)
         if isinstance(item, str):
             try:
-                return self._row.__getitem__(self._key_map[item])
+                return self._row.__getitem__(self._keys.index[item])
             except KeyError:
                 raise IndexError from None
         raise TypeError(f"type {type(item)} not supported")
 
     def keys(self) -> Tuple[Any, ...]:
-        return self._keys
+        return self._keys.names
 
 
 collections.abc.Sequence.register(Row)
+
+
+def dict_row(cur: Cursor, row: Union[tuple, Generator[Optional[Any], Any, None]]) -> Dict[str, Any]:
+    """
+    A row factory that returns every row as a dict from column name to value.
+    """
+    return dict(zip(row_keys(cur).names, row))
+
+
+def namedtuple_row(cur: Cursor, row: Union[tuple, Generator[Optional[Any], Any, None]]) -> tuple:
+    """
+    A row factory that returns every row as a namedtuple. The namedtuple class is made once per result.
+    """
+    return row_keys(cur).namedtuple._make(row)  # type: ignore[attr-defined]
@@ -63,4 +63,11 @@ supported_numpy_types: str = (
     # O object
     # S (byte-)string
     # V void
-)
\ No newline at end of file
+)
+
+# numpy kinds that append() converts to the type of the column they are appended to
+convertible_numpy_types: str = (
+    'O'  # object: str, bytes, Decimal, date, time or datetime, with None for null
+    'S'  # (byte-)string
+    'm'  # timedelta
+)
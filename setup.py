@@ -34,11 +34,13 @@ tests_require = [
     'types-Jinja2',
     'typing-extensions',
     'pymonetdb',
+    'pyarrow',
 ]
 
 extras_require = {
     'test': tests_require,
     'doc': ['sphinx', 'sphinx_rtd_theme'],
+    'arrow': ['pyarrow'],
 
 }
 
@@ -0,0 +1,69 @@
+import asyncio
+import threading
+from unittest import TestCase
+
+import numpy as np
+
+from monetdbe import aio
+
+
+def run(coroutine):
+    return asyncio.run(coroutine)
+
+
+class TestAio(TestCase):
+    def test_execute_fetch(self):
+        async def main():
+            async with await aio.connect() as con:
+                await con.execute("create table example(i int, s string)")
+                await con.executemany("insert into example values (?, ?)", [(1, 'a'), (2, None)])
+                cur = await con.execute("select * from example order by i")
+                self.assertEqual([d.name for d in cur.description], ['i', 's'])
+                self.assertEqual(await cur.fetchall(), [(1, 'a'), (2, None)])
+                await cur.execute("select * from example order by i")
+                df = await cur.fetchdf()
+                self.assertEqual(list(df['i']), [1, 2])
+
+        run(main())
+
+    def test_append_and_iterate(self):
+        async def main():
+            async with await aio.connect() as con:
+                await con.execute("create table example(i int)")
+                await con.append('example', {'i': np.arange(5000, dtype=np.int32)})
+                cur = await con.execute("select * from example order by i")
+                rows = [row async for row in cur]
+                self.assertEqual(rows, [(i,) for i in range(5000)])
+                await cur.execute("select * from example order by i")
+                batches = [batch async for batch in cur.fetchnumpy_batches(rows=2000)]
+                self.assertEqual([len(batch['i']) for batch in batches], [2000, 2000, 1000])
+
+        run(main())
+
+    def test_runs_on_connection_thread(self):
+        async def main():
+            async with await aio.connect() as con:
+                threads = {await con._run(threading.get_ident) for _ in range(3)}
+                self.assertEqual(len(threads), 1)
+                self.assertNotIn(threading.get_ident(), threads)
+
+        run(main())
+
+    def test_does_not_block_event_loop(self):
+        async def main():
+            ticks = 0
+
+            async def tick():
+                nonlocal ticks
+                while True:
+                    await asyncio.sleep(0.001)
+                    ticks += 1
+
+            async with await aio.connect() as con:
+                ticker = asyncio.ensure_future(tick())
+                cur = await con.execute("select count(*) from sys.generate_series(0, 50000000)")
+                ticker.cancel()
+                self.assertEqual(await cur.fetchall(), [(50000000,)])
+            self.assertGreater(ticks, 1)
+
+        run(main())
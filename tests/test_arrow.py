@@ -0,0 +1,59 @@
+from datetime import date, datetime, time
+from decimal import Decimal
+from unittest import TestCase, skipIf
+
+from monetdbe import connect
+
+try:
+    import pyarrow as pa
+except ImportError:
+    pa = None
+
+
+@skipIf(pa is None, "pyarrow not installed")
+class TestArrow(TestCase):
+    def test_fetch_arrow(self):
+        with connect() as con:
+            con.execute("create table example(i int, s string, b boolean, d decimal(10, 2), bl blob, dt date, "
+                        "t time, ts timestamp, f double)")
+            con.execute("insert into example values (1, 'a', true, 1.25, x'00ff', '2020-02-03', '01:02:03', "
+                        "'2020-01-01 05:01:00', 1.5), (null, null, null, null, null, null, null, null, null), "
+                        "(3, 'héllo', false, -0.05, x'', '1969-12-31', '00:00:00', '2000-01-01 00:00:00', 2.0)")
+            table = con.execute("select * from example").fetch_arrow()
+
+            table.validate(full=True)
+            self.assertEqual(table.schema.types, [pa.int32(), pa.string(), pa.bool_(), pa.decimal128(10, 2),
+                                                  pa.binary(), pa.date32(), pa.time32('ms'), pa.timestamp('ms'),
+                                                  pa.float64()])
+            self.assertEqual(table.to_pylist()[0], {
+                'i': 1, 's': 'a', 'b': True, 'd': Decimal('1.25'), 'bl': b'\x00\xff', 'dt': date(2020, 2, 3),
+                't': time(1, 2, 3), 'ts': datetime(2020, 1, 1, 5, 1), 'f': 1.5})
+            self.assertEqual(set(table.to_pylist()[1].values()), {None})
+            self.assertEqual(table.column('s').to_pylist(), ['a', None, 'héllo'])
+            self.assertEqual(table.column('d').to_pylist()[2], Decimal('-0.05'))
+
+    def test_append_arrow(self):
+        data = pa.table({
+            'i': pa.array([1, None, 3], pa.int32()),
+            's': pa.chunked_array([['a', None], ['héllo']]),
+            'b': [True, None, False],
+            'd': pa.array([Decimal('1.25'), None, Decimal('-0.05')], pa.decimal128(10, 2)),
+            'bl': pa.array([b'\x00\xff', None, b''], pa.large_binary()),
+            'dt': [date(2020, 2, 3), None, date(1969, 12, 31)],
+            't': [time(1, 2, 3), None, time(0)],
+            'ts': pa.array([datetime(2020, 1, 1, 5, 1), None, datetime(2000, 1, 1)], pa.timestamp('us')),
+        })
+        with connect() as con:
+            con.execute("create table example(i int, s string, b boolean, d decimal(10, 2), bl blob, dt date, "
+                        "t time, ts timestamp)")
+            con.append_arrow('example', data)
+            con.append_arrow('example', data.slice(2))
+            result = con.execute("select * from example").fetch_arrow()
+            self.assertEqual(result.to_pylist(), data.to_pylist() + data.slice(2).to_pylist())
+
+    def test_append_arrow_dictionary(self):
+        data = pa.table({'s': pa.array(['a', 'b', 'a', None]).dictionary_encode()})
+        with connect() as con:
+            con.execute("create table example(s string)")
+            con.append_arrow('example', data)
+            self.assertEqual(con.execute("select * from example").fetchall(), [('a',), ('b',), ('a',), (None,)])
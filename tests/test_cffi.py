@@ -1,10 +1,13 @@
 import unittest
+import unittest.mock
+import warnings
+import weakref
 from sys import platform
 import numpy as np
 import pytest
 from monetdbe._lowlevel import lib
 from monetdbe import connect
-from monetdbe.exceptions import ProgrammingError
+from monetdbe.exceptions import ProgrammingError, InterfaceError
 
 
 class TestCffi(unittest.TestCase):
@@ -74,7 +77,7 @@ class TestCffi(unittest.TestCase):
             con._internal.append(schema='sys', table=table, data=data)
             con.cursor().insert(table=table, values=data)
 
-    def test_append_unsupported_types(self):
+    def test_append_converted_types(self):
         with connect() as con:
             con.execute("CREATE TABLE test (s string, b blob, d date, t time, ts timestamp)")
             con.execute(
@@ -84,14 +87,22 @@ class TestCffi(unittest.TestCase):
                 """
             )
 
-            with pytest.warns(UserWarning, match="no proper numpy equivalent") as warnings:
-                data = con.execute("select * from test").fetchnumpy()
-                self.assertEqual(len(warnings), 1)
-            with self.assertRaises(con.ProgrammingError):
-                con._internal.append(schema='sys', table='test', data=data)
-            with pytest.warns(UserWarning, match="Falling back to regular insert") as warnings:
+            data = con.execute("select * from test").fetchnumpy()
+            con._internal.append(schema='sys', table='test', data=data)
+            with warnings.catch_warnings():
+                warnings.simplefilter("error")
                 con.cursor().insert(table='test', values=data)
-                self.assertEqual(len(warnings), 1)
+            result = con.execute("select * from test").fetchall()
+            self.assertEqual(result[2:4], result[0:2])
+            self.assertEqual(result[4:6], result[0:2])
+
+    def test_append_unsupported_types(self):
+        with connect() as con:
+            con.execute("CREATE TABLE test (i int)")
+            data = {'i': np.array([1 + 2j])}
+            with pytest.warns(UserWarning, match="Falling back to regular insert"):
+                with self.assertRaisesRegex(InterfaceError, "Error binding parameter 0 - probably unsupported type"):
+                    con.cursor().insert(table='test', values=data)
 
     def test_append_blend(self):
         """
@@ -113,9 +124,109 @@ class TestCffi(unittest.TestCase):
 
             data = con.execute("select * from test").fetchnumpy()
 
+    def test_append_chunked(self):
+        with connect() as con:
+            con.execute("CREATE TABLE test (i int, s string, ts timestamp)")
+            size = 10_001
+            data = {
+                'i': np.arange(size, dtype=np.int32),
+                's': np.ma.masked_array([str(i) for i in range(size)], mask=np.arange(size) % 7 == 0),
+                'ts': np.arange(size).astype('datetime64[s]'),
+            }
+            con.cursor().insert(table='test', values=data, chunk_size=1000)
+            result = con.execute("select * from test order by i").fetchnumpy()
+            self.assertEqual(result['i'].tolist(), data['i'].tolist())
+            self.assertEqual(result['s'].tolist(), data['s'].tolist())
+            self.assertEqual(result['ts'].tolist(), data['ts'].astype('datetime64[ms]').tolist())
+
+    def test_append_chunked_atomic(self):
+        with connect(autocommit=True) as con:
+            con.execute("CREATE TABLE test (s string, t time)")
+            times = np.array([None] * 2_000 + ['not a time'], dtype=object)
+            data = {'s': np.array(['a'] * len(times)), 't': times}
+            with self.assertRaises(ValueError):
+                con.append(table='test', data=data, chunk_size=1000)
+            self.assertEqual(con.execute("select count(*) from test").fetchall(), [(0,)])
+
     def test_get_columns(self):
         with connect() as con:
             con.execute("CREATE TABLE test (i int)")
             con.execute("INSERT INTO test VALUES (1)")
             result = list(con._internal.get_columns(table='test'))
             self.assertEqual(result, [('i', 3)])
+
+    def test_fetchnumpy_outlives_result(self):
+        with connect() as con:
+            con.execute("CREATE TABLE test (i int)")
+            con.execute("INSERT INTO test VALUES (1), (2), (3)")
+            cur = con.execute("select * from test")
+            data = cur.fetchnumpy()
+            result = weakref.ref(cur.result)
+            cur.execute("select 42")  # releases the previous result
+            self.assertIsNotNone(result())  # but the numpy array still holds on to it
+            self.assertEqual(data['i'].tolist(), [1, 2, 3])
+            del data
+            self.assertIsNone(result())
+
+    def test_fetchnumpy_outlives_connection(self):
+        con = connect()
+        con.execute("CREATE TABLE test (i int)")
+        con.execute("INSERT INTO test VALUES (1), (2), (3)")
+        data = con.execute("select * from test").fetchnumpy()
+        internal = con._internal
+        con.close()
+        self.assertIsNotNone(internal._monetdbe_database)  # the array still views the result data
+        self.assertEqual(data['i'].tolist(), [1, 2, 3])
+        del data
+        self.assertIsNone(internal._monetdbe_database)
+
+    def test_interleaved_cursors(self):
+        with connect() as con:
+            con.execute("CREATE TABLE outer_ (i int)")
+            con.execute("CREATE TABLE inner_ (i int, s string)")
+            con.execute("INSERT INTO outer_ VALUES (1), (2), (3)")
+            con.execute("INSERT INTO inner_ VALUES (1, 'a'), (2, 'b'), (3, 'c')")
+            outer = con.execute("select i from outer_ order by i")
+            lookup = con.cursor()
+            found = []
+            for i, in outer:
+                lookup.execute("select s from inner_ where i = ?", (i,))
+                self.assertEqual([d.name for d in lookup.description], ['s'])
+                found.append((i, lookup.fetchone()[0]))
+            self.assertEqual(found, [(1, 'a'), (2, 'b'), (3, 'c')])
+            self.assertEqual([d.name for d in outer.description], ['i'])
+
+    def test_close_releases_cursor_results(self):
+        with connect() as con:
+            first = con.execute("select 1")
+            second = con.execute("select 2")
+            first.close()
+            self.assertIsNone(first.result)
+            self.assertEqual(second.fetchone(), (2,))
+            con.close()
+            self.assertIsNone(second.result)
+
+    def test_execute_batch(self):
+        with connect() as con:
+            con.execute("CREATE TABLE test (i int, s string)")
+            con.execute("INSERT INTO test VALUES (1, 'a'), (2, 'b'), (3, 'c')")
+            affected = con.execute_batch("UPDATE test SET s = ? WHERE i >= ?",
+                                         {0: np.array(['x', 'y']), 1: np.array([3, 1], dtype=np.int32)})
+            self.assertEqual(affected.tolist(), [1, 3])
+            self.assertEqual(con.total_changes, 4)
+            result = con.execute_batch("SELECT i, s FROM test WHERE i = ?",
+                                       {0: np.ma.masked_array([2, 1, 5], mask=[0, 0, 1], dtype=np.int32)})
+            self.assertEqual(result['i'].tolist(), [2, 1])
+            self.assertEqual(result['s'].tolist(), ['y', 'y'])
+            with self.assertRaises(ProgrammingError):
+                con.execute_batch("SELECT ? + ?", {0: np.array([1])})
+
+    def test_failed_execute_batch_cleans_up_once(self):
+        with connect(autocommit=True) as con:
+            con.execute("CREATE TABLE test (i int)")
+            internal = con._internal
+            with unittest.mock.patch.object(internal, 'cleanup_statement', wraps=internal.cleanup_statement) as cleanup:
+                with self.assertRaises(ProgrammingError):
+                    con.execute_batch("UPDATE test SET i = ? WHERE i = ?", {0: np.array([1]), 1: np.array([1, 2])})
+            statements = [call.args[0] for call in cleanup.call_args_list]
+            self.assertEqual(len(statements), len(set(statements)))
@@ -1,10 +1,12 @@
-from datetime import datetime
+from datetime import datetime, date, time, timedelta
+from decimal import Decimal
 from typing import List, Any
 from unittest import TestCase
 from math import isnan
 
 import numpy as np
 import numpy.ma as ma
+import pandas as pd
 from pandas import DataFrame
 from monetdbe import connect, Timestamp
 
@@ -58,6 +60,40 @@ class TestDataFrame(TestCase):
         self.assertEqual(values[:-1], list(df['d'])[:-1])
         self.assertTrue(isnan(df['d'].iloc[-1]))
 
+    def test_decimal(self):
+        values = [Decimal('1.2345'), None, Decimal('-0.0001')]
+        df = connect_and_execute(values, 'decimal(18,4)')
+        self.assertEqual([1.2345, None, -0.0001], list(df['d'].replace({np.nan: None})))
+
+    def test_decimal_numpy(self):
+        with connect(autocommit=True) as con:
+            con.execute("create table example(d decimal(18,4))")
+            con.execute("insert into example(d) values (1.2345), (NULL)")
+            cur = con.execute("select * from example")
+            int_scaled = cur.fetchnumpy(decimal='int_scaled')['d']
+            self.assertEqual(int_scaled.dtype.metadata['scale'], 4)
+            self.assertEqual(int_scaled.tolist(), [12345, None])
+            self.assertEqual(cur.fetchnumpy(decimal='object')['d'].tolist(), [Decimal('1.2345'), None])
+            with self.assertRaises(ValueError):
+                cur.fetchnumpy(decimal='double')
+
+    def test_fetchnumpy_threads(self):
+        with connect(autocommit=True) as con:
+            columns = [f"c{i} {t}" for i, t in enumerate(['int', 'string', 'timestamp', 'decimal(18,4)'] * 5)]
+            con.execute(f"create table example({', '.join(columns)})")
+            values = ["1, 'é', '2020-01-02 10:20:30', 1.2345", "NULL, NULL, NULL, NULL"] * 5
+            con.execute(f"insert into example values ({', '.join(values[0::2])}), ({', '.join(values[1::2])})")
+            cur = con.execute("select * from example")
+            expected = cur.fetchnumpy()
+            parallel = cur.fetchnumpy(threads=4)
+            self.assertEqual(list(expected), list(parallel))
+            for name in expected:
+                self.assertEqual(expected[name].tolist(), parallel[name].tolist())
+            batches = list(cur.fetchdf_batches(rows=1, threads=4))
+            self.assertEqual(len(batches), 2)
+            with self.assertRaises(ValueError):
+                cur.fetchnumpy(threads=0)
+
     def test_char(self):
         values = ['a', 'i', 'é']
         df = connect_and_execute(values, 'char')
@@ -68,6 +104,11 @@ class TestDataFrame(TestCase):
         df = connect_and_execute(values, 'string')
         self.assertEqual(values, list(df['d']))
 
+    def test_string_nil(self):
+        values = ['asssssssssssssssss', None, '日本語', '']
+        df = connect_and_execute(values, 'string')
+        self.assertEqual(values, list(df['d'].replace({np.nan: None})))
+
     def test_string_append(self):
         values = ['asssssssssssssssss', 'iwwwwwwwwwwwwwww', 'éooooooooooooooooooooo']
         df = connect_and_append(values, 'string')
@@ -107,9 +148,77 @@ class TestDataFrame(TestCase):
         result = df['d'].values.astype('datetime64[ms]')
         self.assertEqual(values.tolist(), result.tolist())
 
+    def test_date(self):
+        values = [date(2020, 1, 2), None, date(1969, 12, 31)]
+        df = connect_and_execute(values, 'date')
+        result = df['d'].values.astype('datetime64[D]')
+        self.assertEqual(values, result.tolist())
+
+    def test_time(self):
+        values = [time(10, 20, 30), None, time(0, 0, 0, 500000)]
+        df = connect_and_execute(values, 'time')
+        expected = [timedelta(hours=10, minutes=20, seconds=30), None, timedelta(milliseconds=500)]
+        self.assertEqual(expected, df['d'].values.astype('timedelta64[ms]').tolist())
+
+    def test_timestamp_nil(self):
+        values = [Timestamp(1969, 12, 31, 23, 59, 59, 999000), None]
+        df = connect_and_execute(values, 'timestamp')
+        result = df['d'].values.astype('datetime64[ms]')
+        self.assertEqual(values, result.tolist())
+
     def test_date_nil(self):
         values = np.array(['nat', '2002-02-03'], dtype='datetime64[D]')
         df = connect_and_append(values, 'date')
 
         result = df['d'].values.astype('datetime64[D]')
         self.assertEqual(values.tolist(), result.tolist())
+
+    def test_string_object_append(self):
+        values = ['asssssssssssssssss', None, '日本語', '']
+        df = connect_and_append(np.array(values, dtype=object), 'string', False)
+        self.assertEqual(values, list(df['d'].replace({np.nan: None})))
+
+    def test_string_outlier_append(self):
+        # one long value shouldn't pad every other row to its width
+        values = np.array(['a'] * 1000 + ['é' * 100_000], dtype=np.str_)
+        df = connect_and_append(values, 'string')
+        self.assertEqual(values.tolist(), list(df['d']))
+
+    def test_blob_append(self):
+        values = [b'\x00\x01\x02', None, b'']
+        df = connect_and_append(values, 'blob')
+        self.assertEqual(values, list(df['d'].replace({np.nan: None})))
+
+    def test_bool_nil_append(self):
+        values = [True, None, False]
+        df = connect_and_append(values, 'boolean')
+        self.assertEqual(values, list(df['d'].replace({np.nan: None})))
+
+    def test_decimal_append(self):
+        values = [Decimal('1.2345'), None, Decimal('-0.0001')]
+        df = connect_and_append(values, 'decimal(18,4)')
+        self.assertEqual([1.2345, -0.0001], list(df['d'].dropna()))
+        self.assertTrue(isnan(df['d'][1]))
+
+    def test_date_object_append(self):
+        values = [date(2020, 1, 2), None, date(1969, 12, 31)]
+        df = connect_and_append(values, 'date')
+        self.assertEqual(values, df['d'].values.astype('datetime64[D]').tolist())
+
+    def test_time_object_append(self):
+        values = [time(10, 20, 30), None, time(0, 0, 0, 500000)]
+        df = connect_and_append(values, 'time')
+        expected = [timedelta(hours=10, minutes=20, seconds=30), None, timedelta(milliseconds=500)]
+        self.assertEqual(expected, df['d'].values.astype('timedelta64[ms]').tolist())
+
+    def test_nullable_dtypes_insert(self):
+        df = DataFrame({
+            'i': pd.array([1, None, 3], dtype='Int64'),
+            'b': pd.array([True, None, False], dtype='boolean'),
+            's': pd.array(['x', None, 'z'], dtype='string'),
+        })
+        with connect(autocommit=True) as con:
+            cur = con.execute("create table example(i bigint, b boolean, s string)")
+            cur.insert('example', df)
+            cur.execute("select * from example")
+            self.assertEqual(cur.fetchall(), [(1, True, 'x'), (None, None, None), (3, False, 'z')])
@@ -23,8 +23,10 @@
 
 import threading
 import unittest
+from datetime import datetime, timedelta
 from shutil import rmtree
 from tempfile import NamedTemporaryFile
+from unittest import mock
 
 import monetdbe
 
@@ -416,6 +418,19 @@ class CursorTests(unittest.TestCase):
         with self.assertRaises(TypeError):
             self.cu.executemany("insert into test(income) values (?)", 42)
 
+    def test_ExecuteManyMixedParameters(self):
+        self.cu.executemany("insert into test(name, income) values (?, ?)", [("a", 1.0), ["b", None], ("c", 3)])
+        self.assertEqual(self.cu.rowcount, 3)
+        self.cu.execute("select name, income from test where income is not null order by name")
+        self.assertEqual(self.cu.fetchall(), [("a", 1.0), ("c", 3.0)])
+
+    def test_ExecuteManyAtomic(self):
+        self.cx.set_autocommit(True)
+        with self.assertRaises(monetdbe.ProgrammingError):
+            self.cu.executemany("insert into test(name, income) values (?, ?)", [("a", 1.0), ("b",)])
+        self.cu.execute("select count(*) from test where name in ('a', 'b')")
+        self.assertEqual(self.cu.fetchone()[0], 0)
+
     def test_FetchIter(self):
         # Optional DB-API extension.
         self.cu.execute("delete from test")
@@ -551,7 +566,97 @@ class CursorTests(unittest.TestCase):
         self.assertEqual(results, expected)
 
 
-@unittest.skip("todo (gijs): for now we dont support or check for multi-threading")
+class ExecuteManyAppendTests(unittest.TestCase):
+    def setUp(self):
+        self.cx = monetdbe.connect(":memory:")
+        self.cu = self.cx.cursor()
+        self.cu.execute("create table test(i int, f double, s varchar(10), b boolean, t timestamp)")
+
+    def tearDown(self):
+        self.cu.close()
+        self.cx.close()
+
+    def test_Append(self):
+        rows = [(i, i / 2, str(i), i % 2 == 0, datetime(2020, 1, 1) + timedelta(seconds=i)) for i in range(2000)]
+        rows.append((None, None, None, None, None))
+        self.cu.executemany("insert into test values (?, ?, ?, ?, ?)", rows)
+        self.assertEqual(self.cu.rowcount, 2001)
+        self.cu.execute("select count(*), count(i), count(f), count(s), count(b), count(t) from test")
+        self.assertEqual(self.cu.fetchone(), (2001, 2000, 2000, 2000, 2000, 2000))
+        self.cu.execute("select * from test where i = 3")
+        self.assertEqual(self.cu.fetchone(), rows[3])
+
+    def test_ColumnOrder(self):
+        rows = [(str(i), None, True, 1.0, i) for i in range(2000)]
+        self.cu.executemany("insert into test (s, t, b, f, i) values (?, ?, ?, ?, ?)", rows)
+        self.cu.executemany("insert into test (s, i) values (?, ?)", [(s, i) for s, _, _, _, i in rows])
+        self.cu.execute("select count(*) from test where cast(i as varchar(10)) = s")
+        self.assertEqual(self.cu.fetchone()[0], 4000)
+
+    def test_Constraints(self):
+        self.cu.execute("create table unique_test(x int unique)")
+        with self.assertRaises(monetdbe.IntegrityError):
+            self.cu.executemany("insert into unique_test values (?)", [(i % 1500,) for i in range(2000)])
+
+    def test_TooLong(self):
+        with self.assertRaises(monetdbe.DatabaseError):
+            self.cu.executemany("insert into test (i, f, s, b, t) values (?, ?, ?, ?, ?)",
+                                [(1, 1.0, 'x' * (i % 20), True, None) for i in range(2000)])
+
+
+class StatementCacheTests(unittest.TestCase):
+    def setUp(self):
+        self.cx = monetdbe.connect(":memory:")
+        self.cu = self.cx.cursor()
+        self.cu.execute("create table test(i int, s text)")
+
+    def tearDown(self):
+        self.cu.close()
+        self.cx.close()
+
+    def test_ReuseStatement(self):
+        for i in range(10):
+            self.cu.execute("insert into test(i, s) values (?, ?)", (i, str(i)))
+        self.cu.execute("select count(*) from test where i >= ?", (5,))
+        self.assertEqual(self.cu.fetchone()[0], 5)
+        self.cu.execute("select count(*) from test where i >= ?", (8,))
+        self.assertEqual(self.cu.fetchone()[0], 2)
+
+    def test_DDLInvalidates(self):
+        self.cu.execute("select * from test")
+        self.cu.execute("drop table test")
+        self.cu.execute("create table test(a int, b int, c int)")
+        self.cu.execute("select * from test")
+        self.assertEqual([d[0] for d in self.cu.description], ['a', 'b', 'c'])
+
+    def test_TooFewBindingsOnReuse(self):
+        self.cu.execute("insert into test(i, s) values (?, ?)", (1, 'a'))
+        with self.assertRaises(monetdbe.ProgrammingError):
+            self.cu.execute("insert into test(i, s) values (?, ?)", (2,))
+
+    def test_FailedExecuteManyCleansUpOnce(self):
+        self.cx.set_autocommit(True)
+        internal = self.cx._internal
+        with mock.patch.object(internal, 'cleanup_statement', wraps=internal.cleanup_statement) as cleanup:
+            with self.assertRaises(monetdbe.ProgrammingError):
+                self.cu.executemany("insert into test(i, s) values (?, ?)", [(1, 'a'), (2,)])
+        statements = [call.args[0] for call in cleanup.call_args_list]
+        self.assertEqual(len(statements), len(set(statements)))
+
+    def test_CacheSize(self):
+        self.cx.close()
+        self.cx = monetdbe.connect(":memory:", cached_statements=2)
+        for i in range(5):
+            self.cx.execute(f"select {i}, ?", (i,))
+        self.assertEqual(len(self.cx._internal._statement_cache), 2)
+
+    def test_CacheDisabled(self):
+        self.cx.close()
+        self.cx = monetdbe.connect(":memory:", cached_statements=0)
+        self.cx.execute("select ?", (1,))
+        self.assertEqual(len(self.cx._internal._statement_cache), 0)
+
+
 class ThreadTests(unittest.TestCase):
     def setUp(self):
         self.con = monetdbe.connect(":memory:")
@@ -711,6 +816,71 @@ class ThreadTests(unittest.TestCase):
             self.fail("\n".join(errors))
 
 
+class SharedConnectionTests(unittest.TestCase):
+    def setUp(self):
+        self.con = monetdbe.connect(":memory:", check_same_thread=False, autocommit=True)
+        self.con.execute("create table test(i int)")
+        self.con.executemany("insert into test(i) values (?)", [(i,) for i in range(100)])
+
+    def tearDown(self):
+        self.con.close()
+
+    def test_Readers(self):
+        def run(errors):
+            try:
+                cur = self.con.cursor()
+                for _ in range(20):
+                    cur.execute("select i from test where i < ? order by i", (50,))
+                    if [row[0] for row in cur] != list(range(50)):
+                        errors.append("wrong result")
+                    cur.execute("select count(*) from test")
+                    if cur.fetchone() != (100,):
+                        errors.append("wrong count")
+            except Exception as e:
+                errors.append(repr(e))
+
+        errors = []
+        threads = [threading.Thread(target=run, kwargs={"errors": errors}) for _ in range(4)]
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join()
+        if len(errors) > 0:
+            self.fail("\n".join(errors))
+
+    def test_CloseFromOtherThread(self):
+        t = threading.Thread(target=self.con.close)
+        t.start()
+        t.join()
+        with self.assertRaises(monetdbe.ProgrammingError):
+            self.con.cursor()
+
+
+class GILTests(unittest.TestCase):
+    def test_QueryReleasesGIL(self):
+        """
+        Other python threads should keep running while a query executes
+        """
+        con = monetdbe.connect(":memory:", check_same_thread=False)
+        query = "select count(*) from sys.generate_series(0, 50000000) as a where a.value % 7 = 3"
+        done = threading.Event()
+        result = []
+
+        def run():
+            result.append(con.execute(query).fetchone()[0])
+            done.set()
+
+        ticks = 0
+        t = threading.Thread(target=run)
+        t.start()
+        while not done.wait(0.001):
+            ticks += 1
+        t.join()
+        con.close()
+        self.assertEqual(result, [7142857])
+        self.assertGreater(ticks, 1)
+
+
 class ConstructorTests(unittest.TestCase):
     def test_Date(self):
         d = monetdbe.Date(2004, 10, 28)
@@ -796,7 +966,8 @@ class ExtensionTests(unittest.TestCase):
         with monetdbe.connect(":memory:") as con:
             # NOTE: (gijs) added type int, required for MonetDB
             con.execute("create table test(foo int)")
-            con.executemany("insert into test(foo) values (?)", [(3,), (4,)])
+            cur = con.executemany("insert into test(foo) values (?)", [(3,), (4,)])
+            self.assertEqual(cur.rowcount, 2)
             result = con.execute("select foo from test order by foo").fetchall()
             self.assertEqual(result[0][0], 3, "Basic test of Connection.executemany")
             self.assertEqual(result[1][0], 4, "Basic test of Connection.executemany")
@@ -25,7 +25,7 @@
 import unittest
 from monetdbe.connection import Connection
 from monetdbe.cursors import Cursor  # type: ignore[attr-defined]
-from monetdbe.row import Row
+from monetdbe.row import Row, dict_row, namedtuple_row
 from monetdbe import connect
 from collections.abc import Sequence
 
@@ -233,6 +233,28 @@ class RowFactoryTests(unittest.TestCase):
         self.assertEqual(list(reversed(row)), list(reversed(as_tuple)))
         self.assertIsInstance(row, Sequence)
 
+    def test_monetdbeRowSharesKeys(self):
+        self.con.row_factory = Row
+        first, second = self.con.execute("select 1 as a union all select 2").fetchall()
+        self.assertIs(first._keys, second._keys)
+        with self.assertRaises(AttributeError):
+            first.extra = 1
+
+    def test_DictRow(self):
+        self.con.row_factory = dict_row
+        rows = self.con.execute("select 1 as a, 'x' as b union all select 2, 'y'").fetchall()
+        self.assertEqual(rows, [{'a': 1, 'b': 'x'}, {'a': 2, 'b': 'y'}])
+
+    def test_NamedtupleRow(self):
+        self.con.row_factory = namedtuple_row
+        first, second = self.con.execute("select 1 as a, 'x' as b union all select 2, 'y'").fetchall()
+        self.assertEqual((first.a, first.b), (1, 'x'))
+        self.assertEqual(second, (2, 'y'))
+        self.assertIs(type(first), type(second))
+        cur = self.con.cursor()
+        cur.row_factory = namedtuple_row
+        self.assertEqual(cur.execute("select 3 as c").fetchone()._fields, ('c',))
+
     def test_FakeCursorClass(self):
         # Issue #24257: Incorrect use of PyObject_IsInstance() caused
         # segmentation fault.
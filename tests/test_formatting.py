@@ -1,6 +1,7 @@
 import unittest
 
 import monetdbe as monetdbe
+from monetdbe.formatting import format_query, query_template
 
 
 class TransactionTests(unittest.TestCase):
@@ -36,6 +37,14 @@ class TransactionTests(unittest.TestCase):
         self.con.execute("insert into test(i, s) values (%(name)s, %(str)s)", {'name': 5, 'str': "?%:%(bla)"},
                          paramstyle="pyformat")
 
+    def test_named_is_bound(self):
+        """Named parameters are rewritten to qmark and bound to a prepared statement"""
+        value = "it's :str %s ?"
+        self.con.execute("insert into test(i, s) values (:int, :str)", {'int': 5, 'str': value})
+        self.assertIn("insert into test(i, s) values (?, ?)", self.con._internal._statement_cache)
+        cur = self.con.execute("select s from test where i = %(i)s", {'i': 5}, paramstyle="pyformat")
+        self.assertEqual(cur.fetchall(), [(value,)])
+
     def test_wrongparamstyle(self):
         with self.assertRaises(ValueError):
             self.con.execute("insert into test(i, s) values (%(name)s, %(str)s)", {'name': 5, 'str': "?%:%(bla)"},
@@ -56,3 +65,26 @@ class TransactionTests(unittest.TestCase):
         con2.execute("insert into test(i, s) values (?, ?)", (5, "bla"))
         con1.execute("create table test(i int, s text)")
         con1.execute("insert into test(i, s) values (?, ?)", (5, "bla"))
+
+
+class FormatQueryTests(unittest.TestCase):
+    def test_quoted_placeholders(self):
+        query = "select '?', ':a', \"%s\", 'it\\'s ?' -- ?\n where i = ? /* :b */"
+        self.assertEqual(format_query(query, (1,)), "select '?', ':a', \"%s\", 'it\\'s ?' -- ?\n where i = 1 /* :b */")
+
+    def test_percent_escape(self):
+        self.assertEqual(format_query("select %s, 100 %% 7", ('a',)), "select 'a', 100 % 7")
+        self.assertEqual(format_query("select ?, 100 %% 7", ('a',)), "select 'a', 100 %% 7")
+
+    def test_wrong_parameters(self):
+        for query, parameters in [("select :a, :b", {'a': 1}), ("select :1, :2", (1,)), ("select ?", {'a': 1}),
+                                  ("select :a", (1,)), ("select %s, %s", (1,)), ("select ?", None)]:
+            with self.subTest(query=query), self.assertRaises(monetdbe.ProgrammingError):
+                format_query(query, parameters)
+
+    def test_template_cached(self):
+        query = "select * from test where s = :s"
+        self.assertIs(query_template(query), query_template(query))
+        self.assertEqual(query_template(query).placeholders, [('named', 's')])
+        self.assertEqual(query_template("select 1; -- comment").statements, 1)
+        self.assertEqual(query_template("select 1; select 2").statements, 2)
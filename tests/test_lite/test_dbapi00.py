@@ -27,6 +27,20 @@ class TestSimpleDBAPI:
         # assert str(result) == str(arr), "Incorrect result returned"
         pandas.testing.assert_frame_equal(result, arr)
 
+    def test_numpy_batches(self, monetdbe_cursor):
+        monetdbe_cursor.execute('SELECT * FROM integers')
+        batches = list(monetdbe_cursor.fetchnumpy_batches(rows=4))
+        assert [len(batch['i']) for batch in batches] == [4, 4, 3]
+        arr = numpy.ma.masked_array(numpy.arange(11))
+        arr.mask = [False] * 10 + [True]
+        numpy.testing.assert_array_equal(numpy.ma.concatenate([batch['i'] for batch in batches]), arr)
+
+    def test_pandas_batches(self, monetdbe_cursor):
+        monetdbe_cursor.execute('SELECT * FROM integers')
+        result = pandas.concat(monetdbe_cursor.fetchdf_batches(rows=4), ignore_index=True)
+        monetdbe_cursor.execute('SELECT * FROM integers')
+        pandas.testing.assert_frame_equal(result, monetdbe_cursor.fetchdf())
+
     def test_numpy_creation(self, monetdbe_cursor):
         # numpyarray = {'i': numpy.arange(10), 'v': numpy.random.randint(100, size=(1, 10))}  # segfaults
         data_dict = {'i': numpy.arange(10), 'v': numpy.random.randint(100, size=10)}
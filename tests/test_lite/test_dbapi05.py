@@ -8,3 +8,9 @@ class TestDescription(object):
         monetdbe_cursor.execute('select name from sys.tables')
         assert monetdbe_cursor.description[0][0] == "name"
         assert monetdbe_cursor.description[0][1] == "string"
+
+    def test_description_after_fetchall(self, monetdbe_cursor):
+        monetdbe_cursor.execute('select name from sys.tables')
+        monetdbe_cursor.fetchall()
+        assert monetdbe_cursor.result is None
+        assert monetdbe_cursor.description[0][0] == "name"
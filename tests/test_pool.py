@@ -0,0 +1,114 @@
+from tempfile import TemporaryDirectory
+from threading import Thread
+from unittest import TestCase
+from unittest.mock import patch
+
+from monetdbe import connect
+from monetdbe.exceptions import OperationalError, ProgrammingError
+from monetdbe.pool import ConnectionPool
+
+
+class TestPool(TestCase):
+    def setUp(self):
+        self.directory = TemporaryDirectory()
+        self.pool = ConnectionPool(self.directory.name, min_size=1, max_size=2)
+
+    def tearDown(self):
+        self.pool.close()
+        self.directory.cleanup()
+
+    def test_reuse(self):
+        with self.pool.connection() as con:
+            first = con
+            con.execute("create table example(i int)")
+            con.commit()
+        with self.pool.connection() as con:
+            self.assertIs(con, first)
+        self.assertEqual(self.pool.size, 1)
+
+    def test_reset(self):
+        with self.pool.connection() as con:
+            con.execute("create table example(i int)")
+            con.commit()
+            con.execute("insert into example values (1)")
+            con.row_factory = lambda cur, row: row[0]
+        with self.pool.connection() as con:
+            self.assertIsNone(con.row_factory)
+            self.assertEqual(con.execute("select count(*) from example").fetchall(), [(0,)])
+
+    def test_max_size(self):
+        first = self.pool.acquire()
+        second = self.pool.acquire()
+        self.assertEqual(self.pool.size, 2)
+        with self.assertRaises(OperationalError):
+            self.pool.acquire(timeout=0.01)
+        self.pool.release(first)
+        self.assertIs(self.pool.acquire(timeout=0.01), first)
+        self.pool.release(first)
+        self.pool.release(second)
+
+    def test_threads(self):
+        with self.pool.connection() as con:
+            con.execute("create table example(i int)")
+            con.commit()
+        errors = []
+
+        def run(i):
+            try:
+                with self.pool.connection(timeout=10) as con:
+                    con.execute("insert into example values (?)", (i,))
+                    con.commit()
+            except Exception as e:
+                errors.append(e)
+
+        threads = [Thread(target=run, args=(i,)) for i in range(8)]
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join()
+        self.assertEqual(errors, [])
+        self.assertLessEqual(self.pool.size, 2)
+        with self.pool.connection() as con:
+            self.assertEqual(con.execute("select count(*) from example").fetchall(), [(8,)])
+
+    def test_closed_connection_is_discarded(self):
+        con = self.pool.acquire()
+        con.close()
+        self.pool.release(con)
+        self.assertEqual(self.pool.size, 0)
+
+    def test_release_twice(self):
+        con = self.pool.acquire()
+        self.pool.release(con)
+        with self.assertRaises(ProgrammingError):
+            self.pool.release(con)
+        self.assertEqual(self.pool.idle, 1)
+
+    def test_release_foreign_connection(self):
+        con = connect(self.directory.name)
+        try:
+            with self.assertRaises(ProgrammingError):
+                self.pool.release(con)
+        finally:
+            con.close()
+        self.assertEqual(self.pool.size, 1)
+
+    def test_failed_open_closes_opened_connections(self):
+        opened = []
+        original = ConnectionPool._open
+
+        def open_once(pool):
+            if opened:
+                raise OperationalError("Failed to open database")
+            opened.append(original(pool))
+            return opened[0]
+
+        with patch.object(ConnectionPool, '_open', open_once):
+            with self.assertRaises(OperationalError):
+                ConnectionPool(self.directory.name, min_size=2, max_size=2)
+        self.assertIsNone(opened[0]._internal)
+
+    def test_close(self):
+        self.pool.close()
+        with self.assertRaises(OperationalError):
+            self.pool.acquire()
@@ -21,9 +21,12 @@
 #    misrepresented as being the original software.
 # 3. This notice may not be removed or altered from any source distribution.
 from datetime import datetime, timezone
+from decimal import Decimal
 import unittest
 import zlib
 
+import numpy as np
+
 import monetdbe as monetdbe
 
 
@@ -71,11 +74,50 @@ class monetdbeTypeTests(unittest.TestCase):
         row = self.cur.fetchone()
         self.assertEqual(row[0], sample)
 
+    def test_NumpyScalars(self):
+        self.cur.execute("insert into test(i, s, f) values (?, ?, ?)", (np.int16(7), np.str_("x"), np.float32(0.5)))
+        self.cur.execute("select i, s, f from test where i = ?", (np.int64(7),))
+        self.assertEqual(self.cur.fetchall(), [(7, "x", 0.5)])
+
+    def test_Decimal(self):
+        self.cur.execute("create table decimals(d decimal(10, 2))")
+        self.cur.executemany("insert into decimals(d) values (?)", [
+            (1.15,), (np.float64(2.675),), (np.int32(3),), (Decimal("0.125"),), (Decimal("0.135"),), ("-1.005",)])
+        self.cur.execute("select d from decimals")
+        self.assertEqual([d for d, in self.cur.fetchall()], [
+            Decimal("1.15"), Decimal("2.68"), Decimal("3.00"), Decimal("0.12"), Decimal("0.14"), Decimal("-1.00")])
+
+    def test_None(self):
+        self.cur.execute("insert into test(i, s, f, b) values (?, ?, ?, ?)", (None, None, None, None))
+        self.cur.execute("select i, s, f, b from test")
+        self.assertEqual(self.cur.fetchall(), [(None, None, None, None)])
+
+    def test_WrongType(self):
+        with self.assertRaises(monetdbe.InterfaceError):
+            self.cur.execute("insert into test(i) values (?)", ("42",))
+        with self.assertRaises(monetdbe.DataError):
+            self.cur.execute("insert into test(i) values (?)", (2 ** 64,))
+
     def test_UnicodeExecute(self):
         self.cur.execute("select 'sterreich'")
         row = self.cur.fetchone()
         self.assertEqual(row[0], "sterreich")
 
+    def test_ManyRows(self):
+        self.cur.execute("insert into test(i, s, f) select value, cast(value as text), value / 2.0 "
+                         "from sys.generate_series(0, 10000)")
+        self.cur.execute("insert into test(i) values (NULL)")
+        self.cur.execute("select i, s, f from test")
+        rows = self.cur.fetchall()
+        self.assertEqual(rows, [(i, str(i), i / 2.0) for i in range(10000)] + [(None, None, None)])
+
+    def test_StringOutlier(self):
+        # one long value shouldn't pad every other row of its chunk to its width
+        long = 'x' * 10_000_000
+        self.cur.executemany("insert into test(s) values (?)", [('a',)] * 100 + [(long,), (None,)])
+        self.cur.execute("select s from test")
+        self.assertEqual(self.cur.fetchall(), [('a',)] * 100 + [(long,), (None,)])
+
 
 @unittest.skip("todo: implement, see issue #56")
 class DeclTypesTests(unittest.TestCase):
@@ -313,6 +355,17 @@ class ColNamesTests(unittest.TestCase):
         self.cur.execute("insert into test values (1)")
         self.assertIsNone(self.cur.description)
 
+    def test_CursorDescriptionSizes(self):
+        self.cur.execute("select cast(1.5 as decimal(10, 2)) as d, cast('a' as varchar(20)) as s")
+        d, s = self.cur.description
+        self.assertEqual((d.internal_size, d.precision, d.scale), (8, 10, 2))
+        self.assertEqual((s.internal_size, s.precision), (None, 20))
+
+    def test_CursorDescriptionAfterFetchall(self):
+        self.cur.execute("select * from test")
+        self.cur.fetchall()
+        self.assertEqual(self.cur.description[0][0], "x")
+
 
 class CommonTableExpressionTests(unittest.TestCase):
 